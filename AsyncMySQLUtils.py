@@ -0,0 +1,478 @@
+# -*- coding: utf-8 -*-
+"""MySQL 异步工具类 AsyncMySQLUtils
+
+为 asyncio 服务提供与 MySQLUtils 一致的 API, 基于 aiomysql 异步连接池实现,
+查询等待期间不占用线程, 适合高并发的采集/写入服务。
+
+功能:
+    - 与 MySQLUtils 一致的 select/select_one/execute/execute_many/insert/insert_batch/update/delete API
+    - 异步上下文管理器: async with db.connection() 借出连接, async with db.transaction() 自动提交/回滚
+    - 协程被取消时丢弃正在使用的连接, 避免协议状态不一致的连接回到连接池
+
+依赖安装:
+    pip install aiomysql    # MySQL 异步驱动(依赖 pymysql)
+
+Usage:
+    >>> from AsyncMySQLUtils import AsyncMySQLUtils
+    >>> async with AsyncMySQLUtils(host="localhost", user="root", password="xxx", database="test") as db:
+    ...     rows = await db.select("SELECT * FROM users WHERE age > %s", [18])
+    ...     async with db.transaction() as tx:
+    ...         await tx.execute("UPDATE users SET age = age + 1 WHERE id = %s", [1])
+"""
+# ------------ common ------------
+import asyncio
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union
+)
+
+# ------------ database ------------
+import aiomysql
+from aiomysql import DictCursor
+
+
+class AsyncMySQLUtils:
+    """MySQL 异步工具类
+
+    提供异步连接池管理、增删改查、批量操作和事务支持。
+    基于 aiomysql 实现, 需在 asyncio 事件循环中使用。
+
+    Usage:
+        >>> db = AsyncMySQLUtils(host="localhost", user="root", password="xxx", database="test")
+        >>> await db.connect()
+        >>> results = await db.select("SELECT * FROM users WHERE age > %s", params=[18])
+        >>> await db.close()
+    """
+    _pool: Optional[aiomysql.Pool] = None  # 异步连接池
+    _config: Dict[str, Any] = {}  # 创建连接池的参数
+
+    def __init__(self, host: str = "localhost", port: int = 3306,
+                 user: str = "root", password: str = "",
+                 database: str = "", charset: str = "utf8mb4",
+                 min_connections: int = 2, max_connections: int = 10,
+                 timeout: int = 30, max_lifetime: Optional[float] = 3600, **kwargs):
+        """初始化 MySQL 异步连接池配置, 连接池在 connect() 或进入 async with 时创建
+
+        Args:
+            host (str): 数据库主机地址, 默认为 localhost
+            port (int): 端口号, 默认为 3306
+            user (str): 数据库用户名, 默认为 root
+            password (str): 数据库密码
+            database (str): 数据库名
+            charset (str): 字符集, 默认为 utf8mb4
+            min_connections (int): 连接池最小连接数, 默认为 2
+            max_connections (int): 连接池最大连接数, 并发超过该值的协程会排队等待, 默认为 10
+            timeout (int): 连接超时时间(秒), 默认为 30
+            max_lifetime (Optional[float]): 连接最大存活时间(秒), 超过后在下次取出时重建,
+                应小于服务端 wait_timeout, None 表示不限制, 默认为 3600
+            **kwargs: 传递给 aiomysql 的其他参数。连接固定为 autocommit 模式(事务由 transaction() 显式开启),
+                因此 autocommit 只接受 True
+
+        Raises:
+            ValueError: 传入 autocommit=False 等非 True 值时抛出异常
+
+        Example:
+            >>> db = AsyncMySQLUtils(host="localhost", user="root", password="123456", database="test")
+            >>> db._pool is None
+            True
+        """
+        if kwargs.pop("autocommit", True) is not True:
+            raise ValueError("AsyncMySQLUtils 的连接固定为 autocommit 模式, 需要事务请使用 transaction()")
+        self._config = dict(
+            minsize=min_connections,
+            maxsize=max_connections,
+            pool_recycle=-1 if max_lifetime is None else max_lifetime,
+            host=host,
+            port=port,
+            user=user,
+            password=password,
+            db=database,
+            charset=charset,
+            connect_timeout=timeout,
+            cursorclass=DictCursor,
+            autocommit=True,
+            **kwargs
+        )
+
+    # region ---------------------------- 连接管理 ----------------------------
+
+    async def connect(self) -> None:
+        """创建连接池, 重复调用不会重复创建"""
+        if self._pool is None:
+            self._pool = await aiomysql.create_pool(**self._config)
+
+    async def close(self) -> None:
+        """关闭连接池, 等待借出的连接归还后释放所有连接资源"""
+        if self._pool:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiomysql.Connection]:
+        """从连接池借出一个连接, 退出上下文时归还
+
+        连接处于自动提交模式, 需要事务时使用 transaction() 或先调用 conn.begin();
+        归还时仍有未结束事务的连接会被 aiomysql 直接关闭。
+        协程被取消或连接已损坏(InterfaceError)时, 连接可能停留在读取结果的中途, 此时直接关闭连接而不放回连接池。
+
+        Yields:
+            aiomysql.Connection: aiomysql 连接对象
+
+        Example:
+            >>> async with db.connection() as conn:
+            ...     async with conn.cursor() as cursor:
+            ...         await cursor.execute("SELECT 1")
+        """
+        if self._pool is None:
+            await self.connect()
+        conn = await self._pool.acquire()
+        try:
+            yield conn
+        except (asyncio.CancelledError, aiomysql.InterfaceError):
+            conn.close()
+            raise
+        finally:
+            self._pool.release(conn)
+
+    async def __aenter__(self) -> "AsyncMySQLUtils":
+        """进入异步上下文管理器, 自动创建连接池"""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """退出异步上下文管理器, 自动关闭连接池"""
+        await self.close()
+
+    # endregion ---------------------------- 连接管理 ----------------------------
+
+    # region ---------------------------- 查询操作 ----------------------------
+
+    async def select(self, sql: str, params: Optional[Union[List, Tuple, Dict]] = None,
+                     size: int = -1) -> List[Dict[str, Any]]:
+        """执行查询语句, 返回结果列表
+
+        Args:
+            sql (str): SQL 查询语句, 使用 %s 作为占位符
+            params (Optional[Union[List, Tuple, Dict]]): 查询参数
+            size (int): 返回行数, -1 表示返回全部, 默认为 -1
+
+        Returns:
+            List[Dict[str, Any]]: 查询结果字典列表
+
+        Example:
+            >>> results = await db.select("SELECT * FROM users WHERE age > %s", params=[18])
+            >>> isinstance(results, list)
+            True
+        """
+        async with self.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, params)
+                if size == -1:
+                    return list(await cursor.fetchall())
+                return list(await cursor.fetchmany(size))
+
+    async def select_one(self, sql: str, params: Optional[Union[List, Tuple, Dict]] = None) -> Optional[Dict[str, Any]]:
+        """查询单条记录
+
+        Args:
+            sql (str): SQL 查询语句
+            params (Optional[Union[List, Tuple, Dict]]): 查询参数
+
+        Returns:
+            Optional[Dict[str, Any]]: 单条记录字典, 无结果时返回 None
+
+        Example:
+            >>> user = await db.select_one("SELECT * FROM users WHERE id = %s", params=[1])
+        """
+        async with self.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, params)
+                return await cursor.fetchone()
+
+    # endregion ---------------------------- 查询操作 ----------------------------
+
+    # region ---------------------------- 写入操作 ----------------------------
+
+    async def execute(self, sql: str, params: Optional[Union[List, Tuple, Dict]] = None) -> int:
+        """执行单条 SQL(INSERT/UPDATE/DELETE)
+
+        Args:
+            sql (str): SQL 语句
+            params (Optional[Union[List, Tuple, Dict]]): 参数
+
+        Returns:
+            int: 影响的行数
+
+        Example:
+            >>> affected = await db.execute("UPDATE users SET name=%s WHERE id=%s", params=["new_name", 1])
+        """
+        async with self.connection() as conn:
+            async with conn.cursor() as cursor:
+                return await cursor.execute(sql, params)
+
+    async def execute_many(self, sql: str, params_list: List[Union[List, Tuple, Dict]]) -> int:
+        """批量执行 SQL, INSERT ... VALUES 语句会被 aiomysql 改写为多行插入
+
+        Args:
+            sql (str): SQL 语句
+            params_list (List[Union[List, Tuple, Dict]]): 参数列表
+
+        Returns:
+            int: 影响的总行数
+
+        Example:
+            >>> affected = await db.execute_many(
+            ...     "INSERT INTO users(name, age) VALUES(%s, %s)",
+            ...     [["Alice", 20], ["Bob", 25]]
+            ... )
+        """
+        async with self.connection() as conn:
+            await conn.begin()  # 连接默认自动提交, 显式开启事务使整批要么全部成功要么全部回滚
+            try:
+                async with conn.cursor() as cursor:
+                    affected = await cursor.executemany(sql, params_list)
+                await conn.commit()
+                return affected
+            except aiomysql.MySQLError:
+                await conn.rollback()
+                raise
+
+    async def insert(self, table: str, data: Dict[str, Any]) -> int:
+        """插入单条记录并返回自增 ID
+
+        Args:
+            table (str): 表名
+            data (Dict[str, Any]): 字段名到值的字典
+
+        Returns:
+            int: 自增 ID(如果表有自增主键)
+
+        Example:
+            >>> new_id = await db.insert("users", {"name": "Alice", "age": 20})
+        """
+        columns = ", ".join(data.keys())
+        placeholders = ", ".join(["%s"] * len(data))
+        sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+
+        async with self.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, list(data.values()))
+                return cursor.lastrowid
+
+    async def insert_batch(self, table: str, data_list: List[Dict[str, Any]]) -> int:
+        """批量插入多条记录
+
+        Args:
+            table (str): 表名
+            data_list (List[Dict[str, Any]]): 数据字典列表
+
+        Returns:
+            int: 影响的行数
+
+        Example:
+            >>> affected = await db.insert_batch("users", [
+            ...     {"name": "Alice", "age": 20},
+            ...     {"name": "Bob", "age": 25}
+            ... ])
+        """
+        if not data_list:
+            return 0
+        columns = list(data_list[0].keys())
+        col_str = ", ".join(columns)
+        placeholders = ", ".join(["%s"] * len(columns))
+        sql = f"INSERT INTO {table} ({col_str}) VALUES ({placeholders})"
+
+        params_list = []
+        for data in data_list:
+            params_list.append([data.get(col) for col in columns])
+
+        return await self.execute_many(sql, params_list)
+
+    async def update(self, table: str, data: Dict[str, Any], condition: str,
+                     condition_params: Optional[Union[List, Tuple]] = None) -> int:
+        """更新记录
+
+        Args:
+            table (str): 表名
+            data (Dict[str, Any]): 要更新的字段字典
+            condition (str): WHERE 条件(不含 WHERE 关键字), 使用 %s 占位
+            condition_params (Optional[Union[List, Tuple]]): 条件参数
+
+        Returns:
+            int: 影响的行数
+
+        Example:
+            >>> affected = await db.update("users", {"age": 21}, "id = %s", [1])
+        """
+        set_clause = ", ".join([f"{col} = %s" for col in data.keys()])
+        sql = f"UPDATE {table} SET {set_clause} WHERE {condition}"
+
+        params = list(data.values())
+        if condition_params:
+            params.extend(condition_params)
+
+        return await self.execute(sql, params)
+
+    async def delete(self, table: str, condition: str,
+                     condition_params: Optional[Union[List, Tuple]] = None) -> int:
+        """删除记录
+
+        Args:
+            table (str): 表名
+            condition (str): WHERE 条件(不含 WHERE 关键字)
+            condition_params (Optional[Union[List, Tuple]]): 条件参数
+
+        Returns:
+            int: 影响的行数
+
+        Example:
+            >>> affected = await db.delete("users", "id = %s", [1])
+        """
+        sql = f"DELETE FROM {table} WHERE {condition}"
+        return await self.execute(sql, condition_params)
+
+    # endregion ---------------------------- 写入操作 ----------------------------
+
+    # region ---------------------------- 事务操作 ----------------------------
+
+    def transaction(self) -> "_AsyncMySQLTransaction":
+        """开始一个事务, 返回事务对象
+
+        需通过 async with 使用, 正常退出自动提交, 出现异常自动回滚;
+        也可以在代码块内提前调用 commit/rollback 结束事务并归还连接。
+
+        Returns:
+            _AsyncMySQLTransaction: 事务对象
+
+        Example:
+            >>> async with db.transaction() as tx:
+            ...     await tx.execute("UPDATE accounts SET balance = balance - %s WHERE id = %s", [100, 1])
+            ...     await tx.execute("UPDATE accounts SET balance = balance + %s WHERE id = %s", [100, 2])
+        """
+        return _AsyncMySQLTransaction(self)
+
+    # endregion ---------------------------- 事务操作 ----------------------------
+
+
+class _AsyncMySQLTransaction:
+    """MySQL 异步事务对象, 由 AsyncMySQLUtils.transaction() 创建"""
+    _db: Optional[AsyncMySQLUtils] = None  # 所属工具类
+    _context = None  # 借出事务连接的上下文管理器
+    _conn: Optional[aiomysql.Connection] = None  # 事务专用连接
+
+    def __init__(self, db: AsyncMySQLUtils):
+        """初始化事务对象
+
+        Args:
+            db (AsyncMySQLUtils): 所属工具类
+        """
+        self._db = db
+
+    async def __aenter__(self) -> "_AsyncMySQLTransaction":
+        """借出连接并开始事务"""
+        self._context = self._db.connection()
+        self._conn = await self._context.__aenter__()
+        try:
+            await self._conn.begin()
+        except BaseException as e:
+            await self._release(type(e), e, e.__traceback__)
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """无异常时提交事务, 否则回滚, 然后归还连接"""
+        try:
+            if self._conn is not None:
+                if exc_type is None:
+                    await self._conn.commit()
+                else:
+                    await self._conn.rollback()
+        finally:
+            await self._release(exc_type, exc_val, exc_tb)
+
+    async def _release(self, exc_type=None, exc_val=None, exc_tb=None):
+        """归还事务连接
+
+        Args:
+            exc_type: 异常类型
+            exc_val: 异常对象
+            exc_tb: 异常堆栈
+        """
+        if self._context is not None:
+            context, self._context, self._conn = self._context, None, None
+            await context.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def execute(self, sql: str, params: Optional[Union[List, Tuple, Dict]] = None) -> int:
+        """在事务中执行 SQL
+
+        Args:
+            sql (str): SQL 语句
+            params (Optional[Union[List, Tuple, Dict]]): 参数
+
+        Returns:
+            int: 影响的行数
+        """
+        async with self._conn.cursor() as cursor:
+            return await cursor.execute(sql, params)
+
+    async def execute_many(self, sql: str, params_list: List[Union[List, Tuple, Dict]]) -> int:
+        """在事务中批量执行 SQL
+
+        Args:
+            sql (str): SQL 语句
+            params_list (List[Union[List, Tuple, Dict]]): 参数列表
+
+        Returns:
+            int: 影响的总行数
+        """
+        async with self._conn.cursor() as cursor:
+            return await cursor.executemany(sql, params_list)
+
+    async def select(self, sql: str, params: Optional[Union[List, Tuple, Dict]] = None) -> List[Dict[str, Any]]:
+        """在事务中查询, 可读取本事务未提交的修改
+
+        Args:
+            sql (str): SQL 查询语句
+            params (Optional[Union[List, Tuple, Dict]]): 查询参数
+
+        Returns:
+            List[Dict[str, Any]]: 查询结果字典列表
+        """
+        async with self._conn.cursor() as cursor:
+            await cursor.execute(sql, params)
+            return list(await cursor.fetchall())
+
+    async def select_one(self, sql: str, params: Optional[Union[List, Tuple, Dict]] = None) -> Optional[Dict[str, Any]]:
+        """在事务中查询单条记录
+
+        Args:
+            sql (str): SQL 查询语句
+            params (Optional[Union[List, Tuple, Dict]]): 查询参数
+
+        Returns:
+            Optional[Dict[str, Any]]: 单条记录字典, 无结果时返回 None
+        """
+        async with self._conn.cursor() as cursor:
+            await cursor.execute(sql, params)
+            return await cursor.fetchone()
+
+    async def commit(self):
+        """提交事务并归还连接"""
+        try:
+            await self._conn.commit()
+        finally:
+            await self._release()
+
+    async def rollback(self):
+        """回滚事务并归还连接"""
+        try:
+            await self._conn.rollback()
+        finally:
+            await self._release()
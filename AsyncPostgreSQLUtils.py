@@ -0,0 +1,521 @@
+# -*- coding: utf-8 -*-
+"""PostgreSQL 异步工具类 AsyncPostgreSQLUtils
+
+为 asyncio 服务提供与 PostgreSQLUtils 一致的 API, 基于 psycopg 3 的异步连接池实现。
+针对数据库往返延迟较高的场景, 支持管道模式(pipeline)一次发送多条语句、只等待一次往返,
+以及服务端预编译语句(prepared statement)减少重复解析。
+
+功能:
+    - 与 PostgreSQLUtils 一致的 select/select_one/execute/execute_many/insert/insert_batch/update/delete API
+    - pipeline(): 在同一连接上以管道模式执行多条语句, N 条语句只需约一次网络往返
+    - 预编译语句: 同一连接上执行超过 prepare_threshold 次的语句自动预编译, 也可按调用强制开启/关闭
+    - 异步上下文管理器: async with db.connection() 借出连接, async with db.transaction() 自动提交/回滚
+
+依赖安装:
+    pip install "psycopg[binary]"    # PostgreSQL 驱动 psycopg 3(管道模式需要 libpq 14+)
+    pip install psycopg_pool         # psycopg 3 连接池
+
+Usage:
+    >>> from AsyncPostgreSQLUtils import AsyncPostgreSQLUtils
+    >>> async with AsyncPostgreSQLUtils(host="localhost", user="postgres", password="xxx", database="test") as db:
+    ...     rows = await db.select("SELECT * FROM users WHERE age > %s", [18])
+    ...     user, orders = await db.pipeline([
+    ...         ("SELECT * FROM users WHERE id = %s", [1]),
+    ...         ("SELECT * FROM orders WHERE user_id = %s", [1]),
+    ...     ])
+"""
+# ------------ common ------------
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union
+)
+
+# ------------ database ------------
+import psycopg
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+
+class AsyncPostgreSQLUtils:
+    """PostgreSQL 异步工具类
+
+    提供异步连接池管理、增删改查、管道批量执行和事务支持。
+    基于 psycopg 3 + psycopg_pool 实现, 需在 asyncio 事件循环中使用。
+    连接使用自动提交模式, 单条语句只需一次网络往返; 需要原子性时使用 transaction()。
+
+    Usage:
+        >>> db = AsyncPostgreSQLUtils(host="localhost", user="postgres", password="xxx", database="test")
+        >>> await db.connect()
+        >>> results = await db.select("SELECT * FROM users WHERE age > %s", params=[18])
+        >>> await db.close()
+    """
+    _pool: Optional[AsyncConnectionPool] = None  # 异步连接池
+
+    def __init__(self, host: str = "localhost", port: int = 5432,
+                 user: str = "postgres", password: str = "",
+                 database: str = "", min_connections: int = 2,
+                 max_connections: int = 10, pool_timeout: float = 30,
+                 max_lifetime: float = 3600, prepare_threshold: Optional[int] = 5, **kwargs):
+        """初始化 PostgreSQL 异步连接池配置, 连接池在 connect() 或进入 async with 时打开
+
+        Args:
+            host (str): 数据库主机地址, 默认为 localhost
+            port (int): 端口号, 默认为 5432
+            user (str): 数据库用户名, 默认为 postgres
+            password (str): 数据库密码
+            database (str): 数据库名
+            min_connections (int): 连接池最小连接数, 默认为 2
+            max_connections (int): 连接池最大连接数, 并发超过该值的协程会排队等待, 默认为 10
+            pool_timeout (float): 等待空闲连接的最长时间(秒), 默认为 30
+            max_lifetime (float): 连接最大存活时间(秒), 超过后由连接池重建, 默认为 3600
+            prepare_threshold (Optional[int]): 同一连接上同一语句执行多少次后自动预编译, 默认为 5,
+                0 表示总是预编译, None 表示不自动预编译(经 PgBouncer 事务模式连接时应设为 None)
+            **kwargs: 传递给 psycopg 的其他连接参数, 如 sslmode、application_name
+
+        Example:
+            >>> db = AsyncPostgreSQLUtils(host="localhost", user="postgres", password="123456", database="test")
+            >>> db._pool.closed
+            True
+        """
+        conninfo = make_conninfo(host=host, port=port, user=user, password=password or None,
+                                 dbname=database, **kwargs)
+        self._pool = AsyncConnectionPool(
+            conninfo,
+            min_size=min_connections,
+            max_size=max_connections,
+            timeout=pool_timeout,
+            max_lifetime=max_lifetime,
+            kwargs={"autocommit": True, "row_factory": dict_row, "prepare_threshold": prepare_threshold},
+            open=False
+        )
+
+    # region ---------------------------- 连接管理 ----------------------------
+
+    async def connect(self) -> None:
+        """打开连接池并等待最小连接数建立完成, 重复调用不会重复打开"""
+        if self._pool.closed:
+            await self._pool.open(wait=True)
+
+    async def close(self) -> None:
+        """关闭连接池, 释放所有连接资源"""
+        if not self._pool.closed:
+            await self._pool.close()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[psycopg.AsyncConnection]:
+        """从连接池借出一个连接, 退出上下文时归还, 损坏的连接由连接池自动替换
+
+        Yields:
+            psycopg.AsyncConnection: psycopg 异步连接对象(自动提交模式, 行以字典形式返回)
+
+        Example:
+            >>> async with db.connection() as conn:
+            ...     cursor = await conn.execute("SELECT 1 AS n")
+            ...     await cursor.fetchone()
+            {'n': 1}
+        """
+        await self.connect()
+        async with self._pool.connection() as conn:
+            yield conn
+
+    def pool_stats(self) -> Dict[str, int]:
+        """获取连接池运行指标
+
+        Returns:
+            Dict[str, int]: psycopg_pool 提供的指标, 如 pool_size、pool_available、requests_waiting、
+                requests_wait_ms、connections_lost 等
+        """
+        return self._pool.get_stats()
+
+    async def __aenter__(self) -> "AsyncPostgreSQLUtils":
+        """进入异步上下文管理器, 自动打开连接池"""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """退出异步上下文管理器, 自动关闭连接池"""
+        await self.close()
+
+    # endregion ---------------------------- 连接管理 ----------------------------
+
+    # region ---------------------------- 查询操作 ----------------------------
+
+    async def select(self, sql: str, params: Optional[Union[List, Tuple, Dict]] = None,
+                     size: int = -1, prepare: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """执行查询语句, 返回结果列表
+
+        Args:
+            sql (str): SQL 查询语句, 使用 %s 作为占位符
+            params (Optional[Union[List, Tuple, Dict]]): 查询参数
+            size (int): 返回行数, -1 表示返回全部, 默认为 -1
+            prepare (Optional[bool]): 是否使用预编译语句, 默认为 None 按 prepare_threshold 自动决定
+
+        Returns:
+            List[Dict[str, Any]]: 查询结果字典列表
+
+        Example:
+            >>> results = await db.select("SELECT * FROM users WHERE age > %s", params=[18], prepare=True)
+            >>> isinstance(results, list)
+            True
+        """
+        async with self.connection() as conn:
+            cursor = await conn.execute(sql, params, prepare=prepare)
+            if size == -1:
+                return await cursor.fetchall()
+            return await cursor.fetchmany(size)
+
+    async def select_one(self, sql: str, params: Optional[Union[List, Tuple, Dict]] = None,
+                         prepare: Optional[bool] = None) -> Optional[Dict[str, Any]]:
+        """查询单条记录
+
+        Args:
+            sql (str): SQL 查询语句
+            params (Optional[Union[List, Tuple, Dict]]): 查询参数
+            prepare (Optional[bool]): 是否使用预编译语句, 默认为 None 按 prepare_threshold 自动决定
+
+        Returns:
+            Optional[Dict[str, Any]]: 单条记录字典, 无结果时返回 None
+
+        Example:
+            >>> user = await db.select_one("SELECT * FROM users WHERE id = %s", params=[1])
+        """
+        async with self.connection() as conn:
+            cursor = await conn.execute(sql, params, prepare=prepare)
+            return await cursor.fetchone()
+
+    async def pipeline(self, statements: Sequence[Tuple[str, Optional[Union[List, Tuple, Dict]]]],
+                       prepare: Optional[bool] = None) -> List[Union[List[Dict[str, Any]], int]]:
+        """以管道模式在同一连接上执行多条语句, 语句连续发送, 只在最后等待一次服务端响应
+
+        语句之间互不依赖时(如一个接口需要的多个查询), 总耗时约为一次网络往返而不是 N 次。
+        各语句按自动提交模式独立执行, 需要原子性时请在 transaction() 中调用 tx.pipeline()。
+        客户端 libpq 低于 14 不支持管道模式, 此时自动退化为逐条执行。
+
+        Args:
+            statements (Sequence[Tuple[str, Optional[Union[List, Tuple, Dict]]]]): (SQL, 参数) 列表
+            prepare (Optional[bool]): 是否使用预编译语句, 默认为 None 按 prepare_threshold 自动决定
+
+        Returns:
+            List[Union[List[Dict[str, Any]], int]]: 与 statements 一一对应, 查询语句为结果字典列表,
+                其他语句为影响的行数
+
+        Example:
+            >>> users, affected = await db.pipeline([
+            ...     ("SELECT * FROM users WHERE id = %s", [1]),
+            ...     ("UPDATE users SET last_seen = now() WHERE id = %s", [1]),
+            ... ])
+        """
+        async with self.connection() as conn:
+            return await _run_pipeline(conn, statements, prepare)
+
+    # endregion ---------------------------- 查询操作 ----------------------------
+
+    # region ---------------------------- 写入操作 ----------------------------
+
+    async def execute(self, sql: str, params: Optional[Union[List, Tuple, Dict]] = None,
+                      prepare: Optional[bool] = None) -> int:
+        """执行单条 SQL(INSERT/UPDATE/DELETE)
+
+        Args:
+            sql (str): SQL 语句
+            params (Optional[Union[List, Tuple, Dict]]): 参数
+            prepare (Optional[bool]): 是否使用预编译语句, 默认为 None 按 prepare_threshold 自动决定
+
+        Returns:
+            int: 影响的行数
+
+        Example:
+            >>> affected = await db.execute("UPDATE users SET name = %s WHERE id = %s", params=["new_name", 1])
+        """
+        async with self.connection() as conn:
+            cursor = await conn.execute(sql, params, prepare=prepare)
+            return cursor.rowcount
+
+    async def execute_many(self, sql: str, params_list: List[Union[List, Tuple, Dict]]) -> int:
+        """在一个事务中批量执行 SQL, psycopg 会以管道模式连续发送各组参数
+
+        Args:
+            sql (str): SQL 语句
+            params_list (List[Union[List, Tuple, Dict]]): 参数列表
+
+        Returns:
+            int: 影响的总行数
+
+        Example:
+            >>> affected = await db.execute_many(
+            ...     "INSERT INTO users(name, age) VALUES(%s, %s)",
+            ...     [["Alice", 20], ["Bob", 25]]
+            ... )
+        """
+        async with self.connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor() as cursor:
+                    await cursor.executemany(sql, params_list)
+                    return cursor.rowcount
+
+    async def insert(self, table: str, data: Dict[str, Any]) -> int:
+        """插入单条记录并返回自增 ID
+
+        Args:
+            table (str): 表名
+            data (Dict[str, Any]): 字段名到值的字典
+
+        Returns:
+            int: 自增 ID(RETURNING id)
+
+        Example:
+            >>> new_id = await db.insert("users", {"name": "Alice", "age": 20})
+        """
+        columns = ", ".join(data.keys())
+        placeholders = ", ".join(["%s"] * len(data))
+        sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) RETURNING id"
+
+        async with self.connection() as conn:
+            cursor = await conn.execute(sql, list(data.values()))
+            return (await cursor.fetchone())["id"]
+
+    async def insert_batch(self, table: str, data_list: List[Dict[str, Any]]) -> int:
+        """批量插入多条记录
+
+        Args:
+            table (str): 表名
+            data_list (List[Dict[str, Any]]): 数据字典列表
+
+        Returns:
+            int: 影响的行数
+
+        Example:
+            >>> affected = await db.insert_batch("users", [
+            ...     {"name": "Alice", "age": 20},
+            ...     {"name": "Bob", "age": 25}
+            ... ])
+        """
+        if not data_list:
+            return 0
+        columns = list(data_list[0].keys())
+        col_str = ", ".join(columns)
+        placeholders = ", ".join(["%s"] * len(columns))
+        sql = f"INSERT INTO {table} ({col_str}) VALUES ({placeholders})"
+
+        params_list = []
+        for data in data_list:
+            params_list.append([data.get(col) for col in columns])
+
+        return await self.execute_many(sql, params_list)
+
+    async def update(self, table: str, data: Dict[str, Any], condition: str,
+                     condition_params: Optional[Union[List, Tuple]] = None) -> int:
+        """更新记录
+
+        Args:
+            table (str): 表名
+            data (Dict[str, Any]): 要更新的字段字典
+            condition (str): WHERE 条件, 使用 %s 占位
+            condition_params (Optional[Union[List, Tuple]]): 条件参数
+
+        Returns:
+            int: 影响的行数
+
+        Example:
+            >>> affected = await db.update("users", {"age": 26}, "name = %s", condition_params=["Alice"])
+        """
+        set_clause = ", ".join([f"{col} = %s" for col in data.keys()])
+        sql = f"UPDATE {table} SET {set_clause} WHERE {condition}"
+
+        params = list(data.values())
+        if condition_params:
+            params.extend(condition_params)
+
+        return await self.execute(sql, params)
+
+    async def delete(self, table: str, condition: str,
+                     condition_params: Optional[Union[List, Tuple]] = None) -> int:
+        """删除记录
+
+        Args:
+            table (str): 表名
+            condition (str): WHERE 条件, 使用 %s 占位
+            condition_params (Optional[Union[List, Tuple]]): 条件参数
+
+        Returns:
+            int: 影响的行数
+        """
+        sql = f"DELETE FROM {table} WHERE {condition}"
+        return await self.execute(sql, condition_params)
+
+    # endregion ---------------------------- 写入操作 ----------------------------
+
+    # region ---------------------------- 事务操作 ----------------------------
+
+    def transaction(self) -> "_AsyncPostgreSQLTransaction":
+        """开始一个事务, 返回事务对象
+
+        需通过 async with 使用, 正常退出自动提交, 出现异常自动回滚。
+
+        Returns:
+            _AsyncPostgreSQLTransaction: 事务对象
+
+        Example:
+            >>> async with db.transaction() as tx:
+            ...     await tx.execute("UPDATE accounts SET balance = balance - %s WHERE id = %s", [100, 1])
+            ...     await tx.execute("UPDATE accounts SET balance = balance + %s WHERE id = %s", [100, 2])
+        """
+        return _AsyncPostgreSQLTransaction(self)
+
+    # endregion ---------------------------- 事务操作 ----------------------------
+
+
+async def _run_pipeline(conn: psycopg.AsyncConnection,
+                        statements: Sequence[Tuple[str, Optional[Union[List, Tuple, Dict]]]],
+                        prepare: Optional[bool]) -> List[Union[List[Dict[str, Any]], int]]:
+    """在指定连接上以管道模式执行多条语句
+
+    Args:
+        conn (psycopg.AsyncConnection): psycopg 异步连接对象
+        statements (Sequence[Tuple[str, Optional[Union[List, Tuple, Dict]]]]): (SQL, 参数) 列表
+        prepare (Optional[bool]): 是否使用预编译语句
+
+    Returns:
+        List[Union[List[Dict[str, Any]], int]]: 查询语句为结果字典列表, 其他语句为影响的行数
+    """
+    cursors = []
+    if psycopg.AsyncPipeline.is_supported():
+        async with conn.pipeline():
+            for sql, params in statements:
+                cursors.append(await conn.execute(sql, params, prepare=prepare))
+    else:
+        for sql, params in statements:
+            cursors.append(await conn.execute(sql, params, prepare=prepare))
+    return [await cursor.fetchall() if cursor.description else cursor.rowcount for cursor in cursors]
+
+
+class _AsyncPostgreSQLTransaction:
+    """PostgreSQL 异步事务对象, 由 AsyncPostgreSQLUtils.transaction() 创建"""
+    _db: Optional[AsyncPostgreSQLUtils] = None  # 所属工具类
+    _context = None  # 借出事务连接的上下文管理器
+    _transaction = None  # psycopg 事务上下文管理器
+    _conn: Optional[psycopg.AsyncConnection] = None  # 事务专用连接
+
+    def __init__(self, db: AsyncPostgreSQLUtils):
+        """初始化事务对象
+
+        Args:
+            db (AsyncPostgreSQLUtils): 所属工具类
+        """
+        self._db = db
+
+    async def __aenter__(self) -> "_AsyncPostgreSQLTransaction":
+        """借出连接并开始事务"""
+        self._context = self._db.connection()
+        self._conn = await self._context.__aenter__()
+        try:
+            self._transaction = self._conn.transaction()
+            await self._transaction.__aenter__()
+        except BaseException as e:
+            await self._context.__aexit__(type(e), e, e.__traceback__)
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """无异常时提交事务, 否则回滚, 然后归还连接"""
+        try:
+            await self._transaction.__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            await self._context.__aexit__(exc_type, exc_val, exc_tb)
+
+    def savepoint(self):
+        """创建保存点, 代码块出现异常时只回滚到保存点, 事务本身继续有效
+
+        Returns:
+            psycopg.AsyncTransaction: 可用于 async with 的嵌套事务
+
+        Example:
+            >>> async with db.transaction() as tx:
+            ...     await tx.execute("INSERT INTO orders(id) VALUES(%s)", [1])
+            ...     try:
+            ...         async with tx.savepoint():
+            ...             await tx.execute("INSERT INTO coupons(order_id) VALUES(%s)", [1])
+            ...     except psycopg.errors.UniqueViolation:
+            ...         pass
+        """
+        return self._conn.transaction()
+
+    async def execute(self, sql: str, params: Optional[Union[List, Tuple, Dict]] = None,
+                      prepare: Optional[bool] = None) -> int:
+        """在事务中执行 SQL
+
+        Args:
+            sql (str): SQL 语句
+            params (Optional[Union[List, Tuple, Dict]]): 参数
+            prepare (Optional[bool]): 是否使用预编译语句
+
+        Returns:
+            int: 影响的行数
+        """
+        cursor = await self._conn.execute(sql, params, prepare=prepare)
+        return cursor.rowcount
+
+    async def execute_many(self, sql: str, params_list: List[Union[List, Tuple, Dict]]) -> int:
+        """在事务中批量执行 SQL
+
+        Args:
+            sql (str): SQL 语句
+            params_list (List[Union[List, Tuple, Dict]]): 参数列表
+
+        Returns:
+            int: 影响的总行数
+        """
+        async with self._conn.cursor() as cursor:
+            await cursor.executemany(sql, params_list)
+            return cursor.rowcount
+
+    async def select(self, sql: str, params: Optional[Union[List, Tuple, Dict]] = None,
+                     prepare: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """在事务中查询, 可读取本事务未提交的修改
+
+        Args:
+            sql (str): SQL 查询语句
+            params (Optional[Union[List, Tuple, Dict]]): 查询参数
+            prepare (Optional[bool]): 是否使用预编译语句
+
+        Returns:
+            List[Dict[str, Any]]: 查询结果字典列表
+        """
+        cursor = await self._conn.execute(sql, params, prepare=prepare)
+        return await cursor.fetchall()
+
+    async def select_one(self, sql: str, params: Optional[Union[List, Tuple, Dict]] = None,
+                         prepare: Optional[bool] = None) -> Optional[Dict[str, Any]]:
+        """在事务中查询单条记录
+
+        Args:
+            sql (str): SQL 查询语句
+            params (Optional[Union[List, Tuple, Dict]]): 查询参数
+            prepare (Optional[bool]): 是否使用预编译语句
+
+        Returns:
+            Optional[Dict[str, Any]]: 单条记录字典, 无结果时返回 None
+        """
+        cursor = await self._conn.execute(sql, params, prepare=prepare)
+        return await cursor.fetchone()
+
+    async def pipeline(self, statements: Sequence[Tuple[str, Optional[Union[List, Tuple, Dict]]]],
+                       prepare: Optional[bool] = None) -> List[Union[List[Dict[str, Any]], int]]:
+        """在事务中以管道模式执行多条语句, 任一语句失败时整个事务回滚
+
+        Args:
+            statements (Sequence[Tuple[str, Optional[Union[List, Tuple, Dict]]]]): (SQL, 参数) 列表
+            prepare (Optional[bool]): 是否使用预编译语句
+
+        Returns:
+            List[Union[List[Dict[str, Any]], int]]: 查询语句为结果字典列表, 其他语句为影响的行数
+        """
+        return await _run_pipeline(self._conn, statements, prepare)
@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+"""SQLite 异步工具类 AsyncSqliteUtils
+
+为 asyncio 服务提供 SqliteUtils 的异步门面, 所有数据库操作在每个连接专属的工作线程中执行,
+不会阻塞事件循环。基于 Python 内置 sqlite3 / asyncio 实现, 无需安装第三方依赖。
+
+功能:
+    - 与 SqliteUtils 一致的 execute/fetch/insert/update/delete API, 返回可等待对象
+    - 取消协程时, 排队中的操作不再执行, 正在执行的语句通过 sqlite3 interrupt 中断
+    - 可选的写入合并: 并发的小写入合并到同一个事务中提交, 每条写入使用独立 SAVEPOINT 互不影响
+
+Usage:
+    >>> from AsyncSqliteUtils import AsyncSqliteUtils
+    >>> async with AsyncSqliteUtils('test.db', profile='balanced', batch_writes=True) as db:
+    ...     await db.insert('users', {'name': 'Alice'})
+    ...     rows = await db.fetch_all("SELECT * FROM users")
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union
+)
+
+# ------------ database ------------
+import sqlite3
+from SqliteUtils import SqliteUtils
+
+
+class AsyncSqliteUtils:
+    """SQLite 异步工具类
+
+    每个实例持有一个 SqliteUtils 连接和一个单线程执行器, 连接的创建、使用和关闭都在该线程中完成。
+    开启 batch_writes 后, 同一时刻排队的写操作(execute 写语句、insert、update、delete)
+    会在工作线程中合并为一个事务提交, 大幅减少高并发小写入时的提交次数。
+
+    Usage:
+        >>> db = AsyncSqliteUtils('test.db')
+        >>> await db.connect()
+        >>> row = await db.fetch_one("SELECT * FROM users WHERE id = ?", (1,))
+        >>> await db.disconnect()
+    """
+    _db: Optional[SqliteUtils] = None  # 实际执行操作的同步工具类
+    _executor: Optional[ThreadPoolExecutor] = None  # 连接专属的单线程执行器
+    _pending: Optional[List[Tuple[asyncio.Future, Callable, Tuple]]] = None  # 等待合并提交的写操作
+    _flush_task: Optional[asyncio.Task] = None  # 正在合并提交写操作的任务
+    _running: Optional[object] = None  # 工作线程中正在执行的操作标识, 用于取消时中断
+    _running_lock: Optional[threading.Lock] = None
+
+    def __init__(self, db_path: str, batch_writes: bool = False, max_batch_size: int = 500, **kwargs):
+        """初始化 AsyncSqliteUtils 实例
+
+        Args:
+            db_path (str): SQLite 数据库文件路径
+            batch_writes (bool): 是否合并并发写入到同一事务, 默认为 False
+            max_batch_size (int): 单个合并事务最多包含的写操作数, 默认为 500
+            **kwargs: 传递给 SqliteUtils 的其他参数, 如 profile、cached_statements、query_hook
+
+        Example:
+            >>> db = AsyncSqliteUtils('test.db', profile='balanced', batch_writes=True)
+        """
+        self._db = SqliteUtils(db_path, **kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AsyncSqliteUtils")
+        self.batch_writes = batch_writes
+        self.max_batch_size = max_batch_size
+        self._pending = []
+        self._flush_task = None
+        self._running = None
+        self._running_lock = threading.Lock()
+
+    # region ---------------------------- 连接管理 ----------------------------
+
+    async def connect(self) -> None:
+        """在工作线程中连接数据库"""
+        await self._run(self._db.connect)
+
+    async def disconnect(self) -> None:
+        """等待排队的写操作提交后断开连接, 并关闭工作线程"""
+        if self._flush_task:
+            await asyncio.shield(self._flush_task)
+        await self._run(self._db.disconnect)
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "AsyncSqliteUtils":
+        """进入异步上下文管理器, 自动连接数据库"""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """退出异步上下文管理器, 自动提交或回滚后断开连接"""
+        if exc_type:
+            await self._run(self._db.rollback_transaction)
+        else:
+            await self._run(self._db.commit_transaction)
+        await self.disconnect()
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """在工作线程中执行同步操作
+
+        协程被取消时, 尚未开始的操作直接丢弃; 已经开始的操作通过 Connection.interrupt() 中断,
+        被中断的语句会在工作线程中抛出 sqlite3.OperationalError。
+
+        Args:
+            func (Callable): 同步函数
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            Any: 同步函数的返回值
+        """
+        token = object()
+
+        def job():
+            with self._running_lock:
+                self._running = token
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._running_lock:
+                    self._running = None
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, job)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            with self._running_lock:
+                if self._running is token and self._db.conn:
+                    self._db.conn.interrupt()
+            raise
+
+    # endregion ---------------------------- 连接管理 ----------------------------
+
+    # region ---------------------------- 查询操作 ----------------------------
+
+    async def fetch_one(self, sql: str, params: Union[Tuple, Dict, None] = None) -> Optional[Tuple]:
+        """查询单条记录
+
+        Args:
+            sql (str): 查询 SQL 语句
+            params (Union[Tuple, Dict, None]): SQL 参数
+
+        Returns:
+            Optional[Tuple]: 第一条记录, 如果没有结果则返回 None
+        """
+        return await self._run(self._db.fetch_one, sql, params)
+
+    async def fetch_all(self, sql: str, params: Union[Tuple, Dict, None] = None) -> List[Tuple]:
+        """查询所有记录
+
+        Args:
+            sql (str): 查询 SQL 语句
+            params (Union[Tuple, Dict, None]): SQL 参数
+
+        Returns:
+            List[Tuple]: 所有记录的列表
+        """
+        return await self._run(self._db.fetch_all, sql, params)
+
+    async def fetch_many(self, sql: str, size: int, params: Union[Tuple, Dict, None] = None) -> List[Tuple]:
+        """查询多条记录
+
+        Args:
+            sql (str): 查询 SQL 语句
+            size (int): 要返回的记录数量
+            params (Union[Tuple, Dict, None]): SQL 参数
+
+        Returns:
+            List[Tuple]: 指定数量的记录列表
+        """
+        return await self._run(self._db.fetch_many, sql, size, params)
+
+    async def iter_query(self, sql: str, params: Union[Tuple, Dict, None] = None, batch_size: int = 1000,
+                         as_dict: bool = False) -> AsyncIterator[Union[Tuple, Dict[str, Any]]]:
+        """流式查询记录, 每次在工作线程中读取一批
+
+        Args:
+            sql (str): 查询 SQL 语句
+            params (Union[Tuple, Dict, None]): SQL 参数
+            batch_size (int): 每批读取的行数, 默认为 1000
+            as_dict (bool): 是否以字典形式返回每行, 默认为 False
+
+        Yields:
+            Union[Tuple, Dict[str, Any]]: 单行记录
+
+        Example:
+            >>> async for row in db.iter_query("SELECT * FROM users", as_dict=True):
+            ...     print(row['name'])
+        """
+        batches = self._db.iter_query(sql, params, batch_size, as_dict, yield_batches=True)
+        try:
+            while True:
+                batch = await self._run(next, batches, None)
+                if batch is None:
+                    break
+                for row in batch:
+                    yield row
+        finally:
+            await self._run(batches.close)
+
+    # endregion ---------------------------- 查询操作 ----------------------------
+
+    # region ---------------------------- 写入操作 ----------------------------
+
+    async def execute(self, sql: str, params: Union[Tuple, Dict, None] = None) -> int:
+        """执行 SQL 语句
+
+        写语句在 batch_writes 模式下参与合并提交。由于游标只能在工作线程中使用, 这里返回影响的行数而不是游标,
+        查询请使用 fetch_* 方法。
+
+        Args:
+            sql (str): 要执行的 SQL 语句
+            params (Union[Tuple, Dict, None]): SQL 参数
+
+        Returns:
+            int: 影响的行数, 查询语句为 -1
+        """
+        if self._db._is_read_sql(sql):
+            return await self._run(self._execute, sql, params)
+        return await self._write(self._execute, sql, params)
+
+    async def execute_many(self, sql: str, params_list: List[Union[Tuple, Dict]]) -> int:
+        """批量执行 SQL 语句, 本身已在同一事务中执行, 不参与写入合并
+
+        Args:
+            sql (str): 要执行的 SQL 语句
+            params_list (List[Union[Tuple, Dict]]): 参数列表
+
+        Returns:
+            int: 影响的行数
+        """
+        return await self._run(self._execute_many, sql, params_list)
+
+    async def insert(self, table: str, data: Dict[str, Any]) -> int:
+        """插入单条记录
+
+        Args:
+            table (str): 表名
+            data (Dict[str, Any]): 要插入的数据, 键为列名, 值为数据
+
+        Returns:
+            int: 插入行的 ID(如果表有自增主键)
+        """
+        return await self._write(self._db.insert, table, data)
+
+    async def insert_many(self, table: str, data_list: Iterable[Dict[str, Any]], **kwargs) -> List[int]:
+        """批量插入记录, 参数与 SqliteUtils.insert_many 一致, 不参与写入合并
+
+        Args:
+            table (str): 表名
+            data_list (Iterable[Dict[str, Any]]): 要插入的数据, 生成器会在工作线程中被消费
+            **kwargs: chunk_size、on_conflict、conflict_columns、update_columns
+
+        Returns:
+            List[int]: 每个分块实际写入的行数
+        """
+        return await self._run(self._db.insert_many, table, data_list, **kwargs)
+
+    async def update(self, table: str, data: Dict[str, Any], where: str,
+                     where_params: Union[Tuple, Dict, None] = None) -> int:
+        """更新记录
+
+        Args:
+            table (str): 表名
+            data (Dict[str, Any]): 要更新的数据
+            where (str): WHERE 条件语句(不包含 WHERE 关键字)
+            where_params (Union[Tuple, Dict, None]): WHERE 条件参数
+
+        Returns:
+            int: 受影响的行数
+        """
+        return await self._write(self._db.update, table, data, where, where_params)
+
+    async def delete(self, table: str, where: str, where_params: Union[Tuple, Dict, None] = None) -> int:
+        """删除记录
+
+        Args:
+            table (str): 表名
+            where (str): WHERE 条件语句(不包含 WHERE 关键字)
+            where_params (Union[Tuple, Dict, None]): WHERE 条件参数
+
+        Returns:
+            int: 受影响的行数
+        """
+        return await self._write(self._db.delete, table, where, where_params)
+
+    def _execute(self, sql: str, params: Union[Tuple, Dict, None]) -> int:
+        """在工作线程中执行语句并提交, 返回影响的行数"""
+        rowcount = self._db.execute(sql, params).rowcount
+        self._db._commit()
+        return rowcount
+
+    def _execute_many(self, sql: str, params_list: List[Union[Tuple, Dict]]) -> int:
+        """在工作线程中批量执行语句并提交, 返回影响的行数"""
+        rowcount = self._db.execute_many(sql, params_list).rowcount
+        self._db._commit()
+        return rowcount
+
+    # endregion ---------------------------- 写入操作 ----------------------------
+
+    # region ---------------------------- 写入合并 ----------------------------
+
+    async def _write(self, func: Callable, *args) -> Any:
+        """执行写操作, batch_writes 模式下放入队列等待合并提交
+
+        已进入合并事务的写操作无法取消, 取消协程只会放弃等待结果。
+
+        Args:
+            func (Callable): 在工作线程中执行的同步写函数
+            *args: 写函数的参数
+
+        Returns:
+            Any: 写函数的返回值
+        """
+        if not self.batch_writes:
+            return await self._run(func, *args)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((future, func, args))
+        if self._flush_task is None:
+            # 延迟到当前协程让出控制权后再提交, 使同一轮事件循环中的写操作进入同一批
+            self._flush_task = loop.create_task(self._flush())
+        return await future
+
+    async def _flush(self) -> None:
+        """循环取出排队的写操作, 每批在工作线程中作为一个事务提交"""
+        try:
+            while self._pending:
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:len(batch)]
+                batch = [item for item in batch if not item[0].cancelled()]
+                if not batch:
+                    continue
+                try:
+                    results = await self._run(self._run_batch, [(func, args) for _, func, args in batch])
+                except BaseException as e:
+                    for future, _, _ in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    if isinstance(e, asyncio.CancelledError):
+                        raise
+                    continue
+                for (future, _, _), (ok, value) in zip(batch, results):
+                    if future.done():
+                        continue
+                    if ok:
+                        future.set_result(value)
+                    else:
+                        future.set_exception(value)
+        finally:
+            self._flush_task = None
+
+    def _run_batch(self, items: List[Tuple[Callable, Tuple]]) -> List[Tuple[bool, Any]]:
+        """在工作线程中把一批写操作放进同一个事务
+
+        每个写操作包在独立的 SAVEPOINT 中, 单个操作失败只回滚它自己, 其余操作照常提交。
+
+        Args:
+            items (List[Tuple[Callable, Tuple]]): (写函数, 参数) 列表
+
+        Returns:
+            List[Tuple[bool, Any]]: 与 items 对应的 (是否成功, 返回值或异常) 列表
+        """
+        conn = self._db.conn
+        if conn is None:
+            raise sqlite3.Error("数据库未连接, 请先调用 connect() 方法")
+
+        results: List[Tuple[bool, Any]] = []
+        self._db.begin_transaction()
+        try:
+            for func, args in items:
+                conn.execute("SAVEPOINT batch_write")
+                try:
+                    value = func(*args)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO batch_write")
+                    conn.execute("RELEASE batch_write")
+                    results.append((False, e))
+                else:
+                    conn.execute("RELEASE batch_write")
+                    results.append((True, value))
+            self._db.commit_transaction()
+        except BaseException:
+            self._db.rollback_transaction()
+            raise
+        return results
+
+    # endregion ---------------------------- 写入合并 ----------------------------
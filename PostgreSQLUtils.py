@@ -13,11 +13,28 @@ Usage:
     ...     result = db.query("SELECT * FROM users")
 """
 # ------------ common ------------
+import datetime
+import io
+import json
+import logging
+import re
+import selectors
+import socket
+import threading
+import time
+import uuid
+from decimal import Decimal
+from itertools import chain
 from typing import (
+    IO,
     Any,
+    Callable,
     Dict,
+    Iterable,
+    Iterator,
     List,
     Optional,
+    Set,
     Tuple,
     Union
 )
@@ -25,7 +42,11 @@ from typing import (
 # ------------ database ------------
 import psycopg2
 import psycopg2.extras
-from psycopg2.pool import ThreadedConnectionPool
+from psycopg2 import sql as pgsql
+from psycopg2.extensions import TRANSACTION_STATUS_UNKNOWN, encodings, quote_ident
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+logger = logging.getLogger(__name__)
 
 
 class PostgreSQLUtils:
@@ -39,12 +60,16 @@ class PostgreSQLUtils:
         >>> results = db.select("SELECT * FROM users WHERE age > %s", params=[18])
         >>> db.close()
     """
-    _pool: Optional[ThreadedConnectionPool] = None  # 数据库连接池
+    _pool: Optional["_PostgreSQLPool"] = None  # 数据库连接池
+    _pool_timeout: Optional[float] = 30  # 等待空闲连接的默认最长时间(秒)
+    _listener: Optional["_PostgreSQLListener"] = None  # LISTEN/NOTIFY 监听器, 首次 subscribe 时创建
+    _listener_lock: Optional[threading.Lock] = None  # 创建/停止监听器时加锁
 
     def __init__(self, host: str = "localhost", port: int = 5432,
                  user: str = "postgres", password: str = "",
                  database: str = "", min_connections: int = 2,
-                 max_connections: int = 10, **kwargs):
+                 max_connections: int = 10, pool_timeout: Optional[float] = 30,
+                 max_lifetime: Optional[float] = 3600, validate_after: Optional[float] = 5, **kwargs):
         """初始化 PostgreSQL 连接池
 
         Args:
@@ -54,7 +79,12 @@ class PostgreSQLUtils:
             password (str): 数据库密码
             database (str): 数据库名
             min_connections (int): 连接池最小连接数, 默认为 2
-            max_connections (int): 连接池最大连接数, 默认为 10
+            max_connections (int): 连接池最大连接数, 连接全部借出时后续请求排队等待, 默认为 10
+            pool_timeout (Optional[float]): 等待空闲连接的默认最长时间(秒), None 表示一直等待, 默认为 30
+            max_lifetime (Optional[float]): 连接最大存活时间(秒), 超过后在下次取出时重建,
+                None 表示不限制, 默认为 3600
+            validate_after (Optional[float]): 连接空闲超过该时间(秒)后, 取出时先执行 SELECT 1 检查,
+                失败则重建连接; 0 表示每次取出都检查, None 表示只做不发请求的状态检查, 默认为 5
             **kwargs: 传递给 psycopg2 的其他参数
 
         Example:
@@ -63,9 +93,13 @@ class PostgreSQLUtils:
             True
             >>> db.close()
         """
-        self._pool = ThreadedConnectionPool(
+        self._pool_timeout = pool_timeout
+        self._listener_lock = threading.Lock()
+        self._pool = _PostgreSQLPool(
             minconn=min_connections,
             maxconn=max_connections,
+            max_lifetime=max_lifetime,
+            validate_after=validate_after,
             host=host,
             port=port,
             user=user,
@@ -76,24 +110,62 @@ class PostgreSQLUtils:
 
     # region ---------------------------- 连接管理 ----------------------------
 
-    def get_connection(self):
-        """从连接池获取一个连接
+    def get_connection(self, timeout: Optional[float] = None):
+        """从连接池获取一个连接, 连接全部借出时等待其他线程归还
+
+        Args:
+            timeout (Optional[float]): 最长等待时间(秒), 默认使用初始化时的 pool_timeout
 
         Returns:
             connection: psycopg2 连接对象
+
+        Raises:
+            psycopg2.pool.PoolError: 等待超时或连接池已关闭时抛出异常
         """
-        return self._pool.getconn()
+        return self._pool.getconn(timeout=self._pool_timeout if timeout is None else timeout)
 
-    def put_connection(self, conn):
+    def put_connection(self, conn, close: bool = False):
         """将连接归还到连接池
 
         Args:
             conn: psycopg2 连接对象
+            close (bool): 是否关闭连接而不是放回连接池, 默认为 False
+        """
+        self._pool.putconn(conn, close=close)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """获取连接池运行指标, 用于根据实际负载调整连接池大小
+
+        Returns:
+            Dict[str, Any]: 连接池指标, 包含:
+                - in_use: 当前借出的连接数
+                - idle: 池中空闲连接数
+                - max_connections: 最大连接数
+                - checkouts: 累计取出次数
+                - waits: 因连接全部借出而等待的次数
+                - wait_time: 累计等待时间(秒)
+                - max_wait_time: 单次最长等待时间(秒)
+                - timeouts: 等待超时次数
+                - wait_histogram: 取出连接耗时的分布, 键为桶上限(如 "<=10ms"), 值为次数
+                - validation_failures: 取出时检查失败而重建的次数
+                - recycled: 因超过 max_lifetime 而重建的次数
+
+        Example:
+            >>> db = PostgreSQLUtils(host="localhost", user="postgres", password="123456", database="test")
+            >>> stats = db.pool_stats()
+            >>> stats["wait_histogram"]["<=1ms"] == stats["checkouts"]  # 没有发生过排队
+            True
+            >>> db.close()
         """
-        self._pool.putconn(conn)
+        return self._pool.stats()
 
     def close(self):
         """关闭连接池, 释放所有连接资源"""
+        with self._listener_lock:
+            listener, self._listener = self._listener, None
+        # 在锁外停止: 回调中调用 subscribe/unsubscribe 时也需要这把锁
+        if listener is not None:
+            listener.stop()
         if self._pool:
             self._pool.closeall()
             self._pool = None
@@ -163,6 +235,59 @@ class PostgreSQLUtils:
         finally:
             self.put_connection(conn)
 
+    def select_stream(self, sql: str, params: Optional[Union[List, Tuple, Dict]] = None,
+                      itersize: int = 2000, as_batches: bool = False,
+                      as_dict: bool = True) -> Iterator[Union[Dict[str, Any], Tuple, List]]:
+        """流式查询, 使用命名游标(服务端游标)分批读取结果
+
+        每次只从服务端拉取 itersize 行, 客户端内存占用与结果集大小无关, 适合扫描上亿行的大表。
+        生成器运行期间一直占用一个连接池连接, 迭代结束、提前 break、抛出异常或调用 close() 时
+        都会关闭游标、回滚游标所在的只读事务并归还连接; 连接已损坏时直接关闭, 不会放回连接池。
+
+        注意: 命名游标必须在事务中使用, 生成器未结束前该事务一直处于打开状态,
+        长时间不迭代会阻止 VACUUM 清理旧版本数据, 请尽快消费结果。
+
+        Args:
+            sql (str): SQL 查询语句, 使用 %s 作为占位符
+            params (Optional[Union[List, Tuple, Dict]]): 查询参数
+            itersize (int): 每次从服务端拉取的行数, 默认为 2000
+            as_batches (bool): 是否按批返回(每次产出一个行列表), 默认为 False 逐行返回
+            as_dict (bool): 是否以字典形式返回每行, 默认为 True
+
+        Yields:
+            Union[Dict[str, Any], Tuple, List]: 单行记录, 或 as_batches=True 时的一批记录
+
+        Example:
+            >>> db = PostgreSQLUtils(host="localhost", user="postgres", password="123456", database="test")
+            >>> for row in db.select_stream("SELECT * FROM events WHERE created_at > %s", ["2024-01-01"]):
+            ...     process(row)
+            >>> for batch in db.select_stream("SELECT * FROM events", itersize=10000, as_batches=True):
+            ...     print(len(batch))
+            >>> db.close()
+        """
+        conn = self.get_connection()
+        cursor_factory = psycopg2.extras.RealDictCursor if as_dict else None
+        try:
+            with conn.cursor(name=f"stream_{uuid.uuid4().hex}", cursor_factory=cursor_factory) as cursor:
+                cursor.itersize = itersize
+                cursor.execute(sql, params)
+                while True:
+                    rows = cursor.fetchmany(itersize)
+                    if not rows:
+                        break
+                    if as_dict:
+                        rows = [dict(row) for row in rows]
+                    if as_batches:
+                        yield rows
+                    else:
+                        yield from rows
+        finally:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                conn.close()
+            self.put_connection(conn)
+
     # endregion ---------------------------- 查询操作 ----------------------------
 
     # region ---------------------------- 写入操作 ----------------------------
@@ -286,6 +411,124 @@ class PostgreSQLUtils:
 
         return self.execute_many(sql, params_list)
 
+    def upsert_batch(self, table: str, rows: Iterable[Dict[str, Any]], conflict_cols: Optional[List[str]] = None,
+                     update_cols: Optional[List[str]] = None, returning: Optional[List[str]] = None,
+                     page_size: int = 1000) -> Union[int, List[Optional[Dict[str, Any]]]]:
+        """基于 execute_values 的批量插入/更新, 可返回生成的主键等列
+
+        每 page_size 行拼接为一条 INSERT ... VALUES (...), (...) ON CONFLICT ... RETURNING ... 语句,
+        整批数据在一个事务中完成, 失败时全部回滚。列名以第一条记录的键为准。
+
+        Args:
+            table (str): 表名
+            rows (Iterable[Dict[str, Any]]): 数据字典列表或生成器
+            conflict_cols (Optional[List[str]]): 冲突判断列(需有唯一约束), 默认为 None 表示普通插入
+            update_cols (Optional[List[str]]): 冲突时更新的列, 默认为除 conflict_cols 外的全部列,
+                传入空列表表示冲突时跳过(DO NOTHING)
+            returning (Optional[List[str]]): 需要返回的列, 如 ["id"], 默认为 None 只返回影响行数
+            page_size (int): 每条语句包含的行数, 默认为 1000
+
+        Returns:
+            Union[int, List[Optional[Dict[str, Any]]]]: 未指定 returning 时返回影响的行数;
+                指定时返回与输入顺序一一对应的结果字典列表, DO NOTHING 跳过的行对应 None
+
+        Note:
+            没有行会被跳过时(普通插入或 DO UPDATE), 返回结果按 RETURNING 顺序与输入行一一对应;
+            DO NOTHING 时按冲突列的值把返回结果对应回输入行, 比较前把两边的值规范化为文本
+            (数字统一格式, 日期时间转为 ISO 格式), 因此 1 与 Decimal("1")、"2024-01-01" 与 date 可以匹配。
+            同一批数据中冲突列的值不能重复, 否则 PostgreSQL 会报错
+            "ON CONFLICT DO UPDATE command cannot affect row a second time"。
+
+        Example:
+            >>> db = PostgreSQLUtils(host="localhost", user="postgres", password="123456", database="test")
+            >>> ids = db.upsert_batch("users", [{"email": "a@x.com", "name": "Alice"}, {"email": "b@x.com", "name": "Bob"}],
+            ...                       conflict_cols=["email"], returning=["id"])
+            >>> [row["id"] for row in ids]
+            [1, 2]
+            >>> db.close()
+        """
+        iterator = iter(rows)
+        first = next(iterator, None)
+        if first is None:
+            return [] if returning else 0
+
+        columns = list(first.keys())
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+        if conflict_cols:
+            if update_cols is None:
+                update_cols = [col for col in columns if col not in conflict_cols]
+            if update_cols:
+                set_clause = ", ".join(f"{col} = EXCLUDED.{col}" for col in update_cols)
+                sql += f" ON CONFLICT ({', '.join(conflict_cols)}) DO UPDATE SET {set_clause}"
+            else:
+                sql += f" ON CONFLICT ({', '.join(conflict_cols)}) DO NOTHING"
+        returned_cols = list(dict.fromkeys([*returning, *(conflict_cols or [])])) if returning else []
+        if returning:
+            sql += f" RETURNING {', '.join(returned_cols)}"
+        skips = bool(conflict_cols) and not update_cols  # DO NOTHING 会跳过冲突行
+
+        results: List[Optional[Dict[str, Any]]] = []
+        affected = 0
+        conn = self.get_connection()
+        try:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                page: List[Dict[str, Any]] = []
+                for data in chain((first,), iterator):
+                    page.append(data)
+                    if len(page) >= page_size:
+                        affected += self._upsert_page(cursor, sql, columns, page, conflict_cols, returning,
+                                                      returned_cols, skips, results)
+                        page = []
+                if page:
+                    affected += self._upsert_page(cursor, sql, columns, page, conflict_cols, returning,
+                                                  returned_cols, skips, results)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.put_connection(conn)
+        return results if returning else affected
+
+    @staticmethod
+    def _upsert_page(cursor, sql: str, columns: List[str], page: List[Dict[str, Any]],
+                     conflict_cols: Optional[List[str]], returning: Optional[List[str]], returned_cols: List[str],
+                     skips: bool, results: List[Optional[Dict[str, Any]]]) -> int:
+        """执行 upsert_batch 的一页数据, 并把 RETURNING 结果按输入顺序追加到 results
+
+        Args:
+            cursor: RealDictCursor 游标
+            sql (str): 带 VALUES %s 的语句
+            columns (List[str]): 插入的列
+            page (List[Dict[str, Any]]): 本页数据
+            conflict_cols (Optional[List[str]]): 冲突判断列
+            returning (Optional[List[str]]): 需要返回的列
+            returned_cols (List[str]): RETURNING 子句中的列, 依次为 returning 和 conflict_cols
+            skips (bool): 是否可能跳过冲突行(DO NOTHING)
+            results (List[Optional[Dict[str, Any]]]): 结果列表
+
+        Returns:
+            int: 本页影响的行数
+        """
+        values = [tuple(data.get(col) for col in columns) for data in page]
+        if not returning:
+            psycopg2.extras.execute_values(cursor, sql, values, page_size=len(values))
+            return cursor.rowcount
+
+        returned = psycopg2.extras.execute_values(cursor, sql, values, page_size=len(values), fetch=True)
+        # 未加引号的列名会被 PostgreSQL 折叠为小写, 按位置取游标返回的实际列名
+        names = dict(zip(returned_cols, (column.name for column in cursor.description)))
+
+        if not skips and len(returned) == len(page):
+            # 没有跳过的行时, INSERT ... VALUES 的 RETURNING 顺序与 VALUES 顺序一致
+            results.extend({col: row[names[col]] for col in returning} for row in returned)
+        else:
+            by_key = {tuple(_upsert_key(row[names[col]]) for col in conflict_cols): row for row in returned}
+            for data in page:
+                row = by_key.get(tuple(_upsert_key(data.get(col)) for col in conflict_cols))
+                results.append({col: row[names[col]] for col in returning} if row is not None else None)
+        return len(returned)
+
     def update(self, table: str, data: Dict[str, Any], condition: str,
                condition_params: Optional[Union[List, Tuple]] = None) -> int:
         """更新记录
@@ -330,6 +573,127 @@ class PostgreSQLUtils:
 
     # endregion ---------------------------- 写入操作 ----------------------------
 
+    # region ---------------------------- COPY 导入导出 ----------------------------
+
+    def copy_in(self, table: str, rows_or_dataframe: Any, columns: Optional[List[str]] = None,
+                buffer_size: int = 65536) -> int:
+        """通过 COPY ... FROM STDIN 批量导入数据, 通常比 execute_batch/execute_values 快一个数量级
+
+        数据由生成器逐行编码为 COPY TEXT 格式, 经文件对象按 buffer_size 分段发送给服务端,
+        客户端内存中不会拼出完整的数据缓冲区, 适合导入千万级数据。整个导入在一个事务中完成,
+        失败时全部回滚。
+
+        Args:
+            table (str): 表名
+            rows_or_dataframe (Any): 数据, 支持字典列表/生成器、元组列表/生成器(需指定 columns)、
+                polars.DataFrame 或 PolarsUtils 对象
+            columns (Optional[List[str]]): 导入的列, 默认为第一条记录的键或 DataFrame 的全部列
+            buffer_size (int): 每次发送给服务端的字节数, 默认为 65536
+
+        Returns:
+            int: 导入的行数
+
+        Raises:
+            ValueError: 传入元组数据但未指定 columns 时抛出异常
+
+        Example:
+            >>> db = PostgreSQLUtils(host="localhost", user="postgres", password="123456", database="test")
+            >>> rows = ({"id": i, "name": f"user{i}"} for i in range(1000000))
+            >>> db.copy_in("users", rows)
+            1000000
+            >>> db.copy_in("users", [(1, "Alice"), (2, None)], columns=["id", "name"])
+            2
+            >>> db.close()
+        """
+        frame = rows_or_dataframe.to_polars() if hasattr(rows_or_dataframe, "to_polars") else rows_or_dataframe
+        if hasattr(frame, "iter_rows") and hasattr(frame, "columns"):
+            columns = list(columns or frame.columns)
+            rows = frame.select(columns).iter_rows()
+        else:
+            iterator = iter(frame)
+            first = next(iterator, None)
+            if first is None:
+                return 0
+            if isinstance(first, dict):
+                columns = list(columns or first.keys())
+                rows = (tuple(data.get(col) for col in columns) for data in chain((first,), iterator))
+            elif columns:
+                rows = chain((first,), iterator)
+            else:
+                raise ValueError("传入元组数据时必须指定 columns")
+
+        reader = _CopyReader(rows)
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.copy_expert(sql, reader, size=buffer_size)
+            conn.commit()
+            return reader.rows
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.put_connection(conn)
+
+    def copy_out(self, sql: Optional[str], sink: Union[str, IO], params: Optional[Union[List, Tuple, Dict]] = None,
+                 fmt: str = "csv", header: bool = True, table: Optional[Union[str, Tuple[str, ...]]] = None) -> int:
+        """通过 COPY ... TO STDOUT 导出查询结果或整张表, 数据边接收边写入 sink, 不在内存中缓存结果集
+
+        Args:
+            sql (Optional[str]): 查询语句, 导出整张表时传 None 并指定 table
+            sink (Union[str, IO]): 输出文件路径, 或可写的文件对象(binary 格式需为二进制文件对象)
+            params (Optional[Union[List, Tuple, Dict]]): 查询参数
+            fmt (str): 导出格式, 可选 "csv"、"text"、"binary", 默认为 "csv"
+            header (bool): csv 格式是否输出表头, 默认为 True
+            table (Optional[Union[str, Tuple[str, ...]]]): 直接导出的表, "schema.table" 形式按点号拆分,
+                名称本身包含点号或需要区分大小写时传入 ("schema", "table") 元组; 各部分按标识符引用
+
+        Returns:
+            int: 导出的行数
+
+        Raises:
+            ValueError: fmt 取值无效, 或 sql 与 table 没有恰好指定一个时抛出异常
+
+        Example:
+            >>> db = PostgreSQLUtils(host="localhost", user="postgres", password="123456", database="test")
+            >>> db.copy_out("SELECT * FROM users WHERE age > %s", "users.csv", params=[18])
+            >>> db.copy_out(None, "users.bin", fmt="binary", table="public.users")
+            >>> db.copy_out(None, "orders.csv", table=("Sales", "Orders.2024"))
+            >>> db.close()
+        """
+        if fmt not in ("csv", "text", "binary"):
+            raise ValueError(f"无效的 fmt: {fmt}, 可选值: 'csv'、'text'、'binary'")
+        if (sql is None) == (table is None):
+            raise ValueError("sql 和 table 需要且只能指定一个")
+        options = f"FORMAT {fmt}" + (", HEADER true" if fmt == "csv" and header else "")
+
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                if table is not None:
+                    parts = table.split(".") if isinstance(table, str) else table
+                    source = pgsql.Identifier(*parts).as_string(conn)
+                else:
+                    # mogrify 返回按连接编码编码的字节, 非 UTF8 编码的库不能按 utf-8 解码
+                    source = f"({cursor.mogrify(sql, params).decode(encodings[conn.encoding])})"
+                copy_sql = f"COPY {source} TO STDOUT WITH ({options})"
+                if isinstance(sink, str):
+                    with open(sink, "wb") as file:
+                        cursor.copy_expert(copy_sql, file)
+                else:
+                    cursor.copy_expert(copy_sql, sink)
+                rows = cursor.rowcount
+            conn.commit()
+            return rows
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.put_connection(conn)
+
+    # endregion ---------------------------- COPY 导入导出 ----------------------------
+
     # region ---------------------------- 事务操作 ----------------------------
 
     def transaction(self) -> "_PostgreSQLTransaction":
@@ -344,6 +708,182 @@ class PostgreSQLUtils:
 
     # endregion ---------------------------- 事务操作 ----------------------------
 
+    # region ---------------------------- LISTEN/NOTIFY ----------------------------
+
+    def subscribe(self, channel: str, callback: Callable[[str, Optional[str]], None]):
+        """订阅 NOTIFY 频道, 收到通知时在后台线程中调用 callback(channel, payload)
+
+        首次订阅时从连接池取出一个专用连接, 由后台线程等待其 socket 可读后再 poll,
+        空闲时不发任何请求, 用于替代定时轮询表的变化。返回前 LISTEN 已生效, 之后提交的通知不会丢失。
+        监听连接断开后会自动重连并重新 LISTEN, 此时对每个回调传入 payload=None,
+        表示期间的通知可能丢失, 依赖通知维护的缓存应整体失效。
+
+        Args:
+            channel (str): 频道名, 区分大小写, 与 pg_notify 的第一个参数一致
+            callback (Callable[[str, Optional[str]], None]): 回调函数, 参数为频道名和通知内容,
+                应尽快返回, 耗时操作请交给其他线程; 回调抛出的异常只记录日志
+
+        Raises:
+            psycopg2.pool.PoolError: 获取监听连接超时时抛出异常
+            psycopg2.Error: LISTEN 执行失败时抛出异常
+
+        Example:
+            >>> db = PostgreSQLUtils(host="localhost", user="postgres", password="123456", database="test")
+            >>> cache = {}
+            >>> db.install_notify_trigger("users", channel="users_changes")
+            'users_changes'
+            >>> db.subscribe("users_changes", lambda channel, payload: cache.clear())
+            >>> db.close()
+        """
+        while True:
+            with self._listener_lock:
+                if self._listener is None:
+                    self._listener = _PostgreSQLListener(self)
+                listener = self._listener
+            try:
+                if listener.add(channel, callback):
+                    return
+            except Exception:
+                self.unsubscribe(channel, callback)
+                raise
+            # 监听器在添加期间被其他线程的 unsubscribe 停止, 重新创建
+
+    def unsubscribe(self, channel: str, callback: Optional[Callable[[str, Optional[str]], None]] = None):
+        """取消订阅, 没有任何订阅后停止后台线程并关闭监听连接
+
+        Args:
+            channel (str): 频道名
+            callback (Optional[Callable[[str, Optional[str]], None]]): 要移除的回调, None 表示移除该频道的全部回调
+        """
+        with self._listener_lock:
+            listener = self._listener
+            if listener is None or listener.remove(channel, callback):
+                return
+            self._listener = None
+        # 在锁外停止, 避免回调线程中的 subscribe/unsubscribe 与 join 互相等待; 在回调中调用时不 join
+        listener.stop()
+
+    def install_notify_trigger(self, table: Union[str, Tuple[str, ...]], channel: Optional[str] = None,
+                               key_columns: Optional[List[str]] = None) -> str:
+        """在表上安装发送 NOTIFY 的触发器, 配合 subscribe 实现推送式缓存失效
+
+        通知内容为 JSON 字符串, 包含 table、op(INSERT/UPDATE/DELETE/TRUNCATE) 以及 key_columns 指定的列。
+        不指定 key_columns 时使用语句级触发器, 每条语句只发一条通知, 且同一事务内相同的通知会被合并;
+        指定时使用行级触发器, 每行一条通知(TRUNCATE 仍为语句级)。
+        通知在事务提交后才送达, 回滚的事务不会发出通知。重复调用会替换已有触发器。
+        触发器函数 "{表名}_notify" 创建在表所在的 schema 中, 所有名称均按标识符引用(区分大小写)。
+
+        Args:
+            table (Union[str, Tuple[str, ...]]): 表名, "schema.table" 形式按点号拆分,
+                名称本身包含点号或需要区分大小写时传入 ("schema", "table") 元组, 未指定 schema 时按 search_path 查找
+            channel (Optional[str]): 频道名, 默认为 "{表名}_changes"(表名中的点号替换为下划线)
+            key_columns (Optional[List[str]]): 写入通知的列(一般为主键), 通知内容不能超过 8000 字节,
+                不要放大字段
+
+        Returns:
+            str: 频道名, 可直接传给 subscribe
+
+        Raises:
+            psycopg2.errors.UndefinedTable: 表不存在时抛出异常
+
+        Example:
+            >>> db = PostgreSQLUtils(host="localhost", user="postgres", password="123456", database="test")
+            >>> db.install_notify_trigger("users", key_columns=["id"])
+            'users_changes'
+            >>> # 之后 UPDATE users SET name = 'x' WHERE id = 1 会在 users_changes 频道发出
+            >>> # {"table" : "users", "op" : "UPDATE", "id" : 1}
+            >>> db.close()
+        """
+        parts = table.split(".") if isinstance(table, str) else tuple(table)
+        channel = channel or f"{'_'.join(parts)}_changes"
+        fields = pgsql.SQL("").join(
+            pgsql.SQL(", {}, rec.{}").format(pgsql.Literal(col), pgsql.Identifier(col)) for col in key_columns or []
+        )
+
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                target, function, trigger, truncate_trigger = self._notify_names(cursor, parts)
+                cursor.execute(pgsql.SQL("""
+                    CREATE OR REPLACE FUNCTION {}() RETURNS trigger AS $$
+                    DECLARE
+                        rec RECORD;
+                    BEGIN
+                        IF TG_LEVEL = 'ROW' THEN
+                            IF TG_OP = 'DELETE' THEN rec := OLD; ELSE rec := NEW; END IF;
+                            PERFORM pg_notify(%s, json_build_object('table', TG_TABLE_NAME, 'op', TG_OP{})::text);
+                        ELSE
+                            PERFORM pg_notify(%s, json_build_object('table', TG_TABLE_NAME, 'op', TG_OP)::text);
+                        END IF;
+                        RETURN NULL;
+                    END;
+                    $$ LANGUAGE plpgsql
+                """).format(function, fields), [channel, channel])
+                cursor.execute(pgsql.SQL("DROP TRIGGER IF EXISTS {} ON {}").format(trigger, target))
+                cursor.execute(pgsql.SQL("DROP TRIGGER IF EXISTS {} ON {}").format(truncate_trigger, target))
+                if key_columns:
+                    cursor.execute(pgsql.SQL(
+                        "CREATE TRIGGER {} AFTER INSERT OR UPDATE OR DELETE ON {} FOR EACH ROW EXECUTE FUNCTION {}()"
+                    ).format(trigger, target, function))
+                    cursor.execute(pgsql.SQL(
+                        "CREATE TRIGGER {} AFTER TRUNCATE ON {} FOR EACH STATEMENT EXECUTE FUNCTION {}()"
+                    ).format(truncate_trigger, target, function))
+                else:
+                    cursor.execute(pgsql.SQL(
+                        "CREATE TRIGGER {} AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {} "
+                        "FOR EACH STATEMENT EXECUTE FUNCTION {}()"
+                    ).format(trigger, target, function))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.put_connection(conn)
+        return channel
+
+    def remove_notify_trigger(self, table: Union[str, Tuple[str, ...]]):
+        """删除 install_notify_trigger 安装的触发器和触发器函数
+
+        Args:
+            table (Union[str, Tuple[str, ...]]): 表名, 格式同 install_notify_trigger
+        """
+        parts = table.split(".") if isinstance(table, str) else tuple(table)
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                target, function, trigger, truncate_trigger = self._notify_names(cursor, parts)
+                cursor.execute(pgsql.SQL("DROP TRIGGER IF EXISTS {} ON {}").format(trigger, target))
+                cursor.execute(pgsql.SQL("DROP TRIGGER IF EXISTS {} ON {}").format(truncate_trigger, target))
+                cursor.execute(pgsql.SQL("DROP FUNCTION IF EXISTS {}()").format(function))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.put_connection(conn)
+
+    @staticmethod
+    def _notify_names(cursor, parts: Tuple[str, ...]) -> Tuple[pgsql.Identifier, ...]:
+        """解析表所在的 schema, 生成通知触发器相关的标识符
+
+        Args:
+            cursor: psycopg2 游标对象
+            parts (Tuple[str, ...]): 表名各部分
+
+        Returns:
+            Tuple[pgsql.Identifier, ...]: (表, schema 限定的触发器函数, 触发器, TRUNCATE 触发器)
+        """
+        cursor.execute(
+            "SELECT n.nspname, c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.oid = %s::regclass",
+            [pgsql.Identifier(*parts).as_string(cursor)]
+        )
+        schema, relname = cursor.fetchone()
+        return (pgsql.Identifier(schema, relname), pgsql.Identifier(schema, f"{relname}_notify"),
+                pgsql.Identifier(f"{relname}_notify"), pgsql.Identifier(f"{relname}_notify_truncate"))
+
+    # endregion ---------------------------- LISTEN/NOTIFY ----------------------------
+
     def table_exists(self, table: str) -> bool:
         """检查表是否存在
 
@@ -376,6 +916,131 @@ class PostgreSQLUtils:
         """, params=[table])
 
 
+def _upsert_key(value: Any) -> Optional[str]:
+    """把冲突列的值规范化为文本, 使输入值与数据库返回值在类型不同时也能匹配
+
+    Args:
+        value (Any): 输入值或数据库返回值
+
+    Returns:
+        Optional[str]: 规范化后的文本, None 保持不变
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return format(Decimal(str(value)).normalize(), "f")
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, str):
+        try:
+            return format(Decimal(value).normalize(), "f")
+        except ArithmeticError:
+            return value
+    return str(value)
+
+
+class _CopyReader(io.RawIOBase):
+    """把行迭代器编码为 COPY TEXT 格式的只读文件对象, 供 copy_expert 按需读取"""
+    _ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})  # TEXT 格式的转义规则
+    _NEEDS_ESCAPE = re.compile(r"[\\\t\n\r]").search  # 只有包含特殊字符的字符串才做转义
+
+    def __init__(self, rows: Iterable[Tuple]):
+        """初始化读取器
+
+        Args:
+            rows (Iterable[Tuple]): 行元组迭代器
+        """
+        super().__init__()
+        self._lines = (self._encode(row) for row in rows)
+        self._buffer = b""
+        self.rows = 0  # 已编码的行数
+
+    def readable(self) -> bool:
+        """是否可读"""
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        """读取最多 size 字节
+
+        Args:
+            size (int): 最多读取的字节数, -1 表示读完全部
+
+        Returns:
+            bytes: 编码后的数据, 读完时返回 b""
+        """
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            chunks.append(line)
+            length += len(line)
+            self.rows += 1
+        data = b"".join(chunks)
+        if size < 0:
+            self._buffer = b""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+    def readline(self, size: int = -1) -> bytes:
+        """读取一行
+
+        Args:
+            size (int): 忽略, 仅为兼容文件接口
+
+        Returns:
+            bytes: 一行编码后的数据
+        """
+        if self._buffer:
+            line, sep, rest = self._buffer.partition(b"\n")
+            self._buffer = rest
+            return line + sep
+        line = next(self._lines, None)
+        if line is None:
+            return b""
+        self.rows += 1
+        return line
+
+    @classmethod
+    def _encode(cls, row: Tuple) -> bytes:
+        """编码单行数据
+
+        Args:
+            row (Tuple): 行元组
+
+        Returns:
+            bytes: 以换行符结尾的 COPY TEXT 行
+        """
+        return ("\t".join(map(cls._field, row)) + "\n").encode("utf-8")
+
+    @classmethod
+    def _field(cls, value: Any) -> str:
+        """格式化单个字段
+
+        Args:
+            value (Any): 字段值
+
+        Returns:
+            str: 转义后的字段文本, NULL 为 \\N
+        """
+        kind = type(value)
+        if kind is str:
+            return value.translate(cls._ESCAPES) if cls._NEEDS_ESCAPE(value) else value
+        if kind is int or kind is float:
+            return str(value)
+        if value is None:
+            return "\\N"
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return "\\\\x" + bytes(value).hex()
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, ensure_ascii=False, default=str)
+        return str(value).translate(cls._ESCAPES)
+
+
 class _PostgreSQLTransaction:
     """PostgreSQL 事务对象, 由 PostgreSQLUtils.transaction() 创建"""
     _conn = None  # 事务专用连接
@@ -418,3 +1083,386 @@ class _PostgreSQLTransaction:
             self._conn.rollback()
         finally:
             self._pool_ref.put_connection(self._conn)
+
+
+class _PostgreSQLPool(ThreadedConnectionPool):
+    """可等待的连接池, 由 PostgreSQLUtils 创建
+
+    ThreadedConnectionPool 在连接全部借出时直接抛出 PoolError, 这里用条件变量替换其锁,
+    使 getconn 可以等待其他线程归还连接, 并在取出时检查连接状态和存活时间、记录等待耗时分布。
+    """
+    _WAIT_BUCKETS = ((0.001, "<=1ms"), (0.01, "<=10ms"), (0.1, "<=100ms"), (1.0, "<=1s"),
+                     (10.0, "<=10s"), (float("inf"), ">10s"))  # 等待耗时直方图的桶
+    _max_lifetime: Optional[float] = None  # 连接最大存活时间(秒)
+    _validate_after: Optional[float] = None  # 空闲超过该时间(秒)后取出时执行 SELECT 1 检查
+
+    def __init__(self, minconn: int, maxconn: int, *args, max_lifetime: Optional[float] = None,
+                 validate_after: Optional[float] = None, **kwargs):
+        """初始化连接池
+
+        Args:
+            minconn (int): 最小连接数, 也是空闲连接的保留上限
+            maxconn (int): 最大连接数
+            *args: 传递给 psycopg2.connect 的位置参数
+            max_lifetime (Optional[float]): 连接最大存活时间(秒), None 表示不限制
+            validate_after (Optional[float]): 空闲超过该时间(秒)后取出时执行 SELECT 1 检查, None 表示不检查
+            **kwargs: 传递给 psycopg2.connect 的其他参数
+        """
+        self._max_lifetime = max_lifetime
+        self._validate_after = validate_after
+        self._born: Dict[int, float] = {}  # id(连接) -> 创建时间
+        self._returned: Dict[int, float] = {}  # id(连接) -> 最近一次归还时间
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._timeouts = 0
+        self._validation_failures = 0
+        self._recycled = 0
+        self._histogram = {label: 0 for _, label in self._WAIT_BUCKETS}
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self._lock = threading.Condition()
+
+    def _connect(self, key=None):
+        """创建新连接并记录创建时间"""
+        conn = super()._connect(key)
+        self._born[id(conn)] = time.monotonic()
+        return conn
+
+    def getconn(self, key=None, timeout: Optional[float] = None):
+        """取出一个连接, 连接全部借出时最多等待 timeout 秒
+
+        Args:
+            key: psycopg2 连接池的连接键, 一般不需要指定
+            timeout (Optional[float]): 最长等待时间(秒), None 表示一直等待
+
+        Returns:
+            connection: psycopg2 连接对象
+
+        Raises:
+            PoolError: 等待超时或连接池已关闭时抛出异常
+        """
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        with self._lock:
+            waited = False
+            while not self.closed and not self._pool and len(self._used) >= self.maxconn \
+                    and (key is None or key not in self._used):
+                if not waited:
+                    waited = True
+                    self._waits += 1
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._timeouts += 1
+                    self._wait_time += time.monotonic() - start
+                    raise PoolError(f"等待数据库连接超时({timeout} 秒)")
+                self._lock.wait(remaining)
+            conn = self._getconn(key)
+            elapsed = time.monotonic() - start
+            self._checkouts += 1
+            if waited:
+                self._wait_time += elapsed
+                self._max_wait_time = max(self._max_wait_time, elapsed)
+            for limit, label in self._WAIT_BUCKETS:
+                if elapsed <= limit:
+                    self._histogram[label] += 1
+                    break
+        return self._check(conn)
+
+    def _check(self, conn):
+        """检查取出的连接, 已断开、检查失败或超过最大存活时间时重建
+
+        Args:
+            conn: psycopg2 连接对象
+
+        Returns:
+            connection: 可用的 psycopg2 连接对象
+        """
+        now = time.monotonic()
+        if self._max_lifetime is not None and now - self._born.get(id(conn), now) >= self._max_lifetime:
+            with self._lock:
+                self._recycled += 1
+            return self._replace(conn)
+
+        alive = not conn.closed and conn.info.transaction_status != TRANSACTION_STATUS_UNKNOWN
+        idle = now - self._returned.get(id(conn), now)
+        if alive and self._validate_after is not None and idle >= self._validate_after:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                conn.rollback()
+            except psycopg2.Error:
+                alive = False
+        if not alive:
+            with self._lock:
+                self._validation_failures += 1
+            return self._replace(conn)
+        return conn
+
+    def _replace(self, conn):
+        """关闭旧连接并用新连接替换其在连接池中的占位
+
+        Args:
+            conn: 需要替换的 psycopg2 连接对象
+
+        Returns:
+            connection: 新的 psycopg2 连接对象
+
+        Raises:
+            psycopg2.OperationalError: 新连接创建失败时归还占位并抛出异常
+        """
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+        try:
+            fresh = psycopg2.connect(*self._args, **self._kwargs)
+        except Exception:
+            self.putconn(conn, close=True)
+            raise
+        with self._lock:
+            key = self._rused.pop(id(conn))
+            self._born.pop(id(conn), None)
+            self._returned.pop(id(conn), None)
+            self._used[key] = fresh
+            self._rused[id(fresh)] = key
+            self._born[id(fresh)] = time.monotonic()
+        return fresh
+
+    def putconn(self, conn=None, key=None, close: bool = False):
+        """归还连接并唤醒一个等待中的线程
+
+        Args:
+            conn: psycopg2 连接对象
+            key: psycopg2 连接池的连接键, 一般不需要指定
+            close (bool): 是否关闭连接而不是放回连接池
+        """
+        with self._lock:
+            self._putconn(conn, key, close)
+            if conn is not None and conn.closed:
+                self._born.pop(id(conn), None)
+                self._returned.pop(id(conn), None)
+            elif conn is not None:
+                self._returned[id(conn)] = time.monotonic()
+            self._lock.notify()
+
+    def closeall(self):
+        """关闭所有连接, 并唤醒所有等待中的线程(随后抛出 PoolError)"""
+        with self._lock:
+            self._closeall()
+            self._lock.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """获取连接池运行指标
+
+        Returns:
+            Dict[str, Any]: 连接池指标, 字段说明见 PostgreSQLUtils.pool_stats()
+        """
+        with self._lock:
+            return {
+                "in_use": len(self._used),
+                "idle": len(self._pool),
+                "max_connections": self.maxconn,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_time": self._wait_time,
+                "max_wait_time": self._max_wait_time,
+                "timeouts": self._timeouts,
+                "wait_histogram": dict(self._histogram),
+                "validation_failures": self._validation_failures,
+                "recycled": self._recycled,
+            }
+
+
+class _PostgreSQLListener:
+    """LISTEN/NOTIFY 监听器, 由 PostgreSQLUtils.subscribe() 创建
+
+    独占一个连接池连接, 后台线程用 selectors 等待该连接的 socket 可读后再 poll 并分发通知。
+    LISTEN/UNLISTEN 也只在后台线程中执行, 调用方通过 socketpair 唤醒它, 避免两个线程同时使用同一连接。
+    """
+    _KEEPALIVE = 30.0  # 空闲超过该时间(秒)执行一次 SELECT 1, 及时发现已断开的连接
+    _RECONNECT_DELAY = 1.0  # 连接失败后重试的间隔(秒)
+
+    def __init__(self, db: "PostgreSQLUtils"):
+        """初始化监听器, 取出专用连接并启动后台线程
+
+        Args:
+            db (PostgreSQLUtils): 所属的 PostgreSQLUtils 实例
+
+        Raises:
+            psycopg2.pool.PoolError: 获取连接超时时抛出异常
+        """
+        self._db = db
+        self._conn = self._connect()
+        self._callbacks: Dict[str, List[Callable[[str, Optional[str]], None]]] = {}  # 频道 -> 回调列表
+        self._cond = threading.Condition()
+        self._version = 0  # 订阅变更的版本号
+        self._applied = 0  # 后台线程已生效的版本号
+        self._error: Optional[BaseException] = None  # 最近一次 LISTEN 失败的异常
+        self._stopping = False
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._thread = threading.Thread(target=self._run, name="postgresql-listener", daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        """从连接池取出监听连接, 设置为自动提交以便 LISTEN 立即生效"""
+        conn = self._db.get_connection()
+        conn.autocommit = True
+        return conn
+
+    def add(self, channel: str, callback: Callable[[str, Optional[str]], None]) -> bool:
+        """添加回调, 频道为新频道时等待后台线程执行 LISTEN
+
+        Args:
+            channel (str): 频道名
+            callback (Callable[[str, Optional[str]], None]): 回调函数
+
+        Returns:
+            bool: 是否添加成功, 监听器已停止时返回 False, 调用方应改用新的监听器
+
+        Raises:
+            psycopg2.Error: LISTEN 执行失败时抛出异常
+        """
+        with self._cond:
+            if self._stopping:
+                return False
+            callbacks = self._callbacks.setdefault(channel, [])
+            callbacks.append(callback)
+            if len(callbacks) > 1:
+                return True
+            self._version += 1
+            version = self._version
+            self._error = None
+        self._wake()
+        if threading.current_thread() is self._thread:  # 在回调中订阅, 下一轮循环生效
+            return True
+        with self._cond:
+            while self._applied < version and self._error is None and not self._stopping:
+                self._cond.wait()
+            if self._applied < version and self._error is not None:
+                raise self._error
+            return self._applied >= version
+
+    def remove(self, channel: str, callback: Optional[Callable[[str, Optional[str]], None]] = None) -> bool:
+        """移除回调, 频道没有回调后由后台线程执行 UNLISTEN
+
+        Args:
+            channel (str): 频道名
+            callback (Optional[Callable[[str, Optional[str]], None]]): 要移除的回调, None 表示全部
+
+        Returns:
+            bool: 是否还有其他订阅
+        """
+        with self._cond:
+            callbacks = self._callbacks.get(channel, [])
+            if callback is not None and callback in callbacks:
+                callbacks.remove(callback)
+            if callback is None or not callbacks:
+                if self._callbacks.pop(channel, None) is not None:
+                    self._version += 1
+            remaining = bool(self._callbacks)
+        self._wake()
+        return remaining
+
+    def stop(self):
+        """停止后台线程并关闭监听连接"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._wake()
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def _wake(self):
+        """唤醒后台线程"""
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:  # 缓冲区已满说明后台线程尚未读取, 已经会被唤醒
+            pass
+
+    def _run(self):
+        """后台线程: 同步 LISTEN 状态、等待 socket 可读并分发通知, 连接断开时重连"""
+        selector = selectors.DefaultSelector()
+        selector.register(self._wake_r, selectors.EVENT_READ)
+        listened: Set[str] = set()
+        fd = None
+        reconnected = False
+        try:
+            while True:
+                with self._cond:
+                    if self._stopping:
+                        break
+                    version = self._version
+                    wanted = set(self._callbacks)
+                try:
+                    if self._conn is None:
+                        self._conn = self._connect()
+                        listened = set()
+                        reconnected = True
+                    if fd is None:
+                        fd = self._conn.fileno()
+                        selector.register(fd, selectors.EVENT_READ)
+
+                    with self._conn.cursor() as cursor:
+                        for channel in wanted - listened:
+                            cursor.execute(f"LISTEN {quote_ident(channel, self._conn)}")
+                        for channel in listened - wanted:
+                            cursor.execute(f"UNLISTEN {quote_ident(channel, self._conn)}")
+                    listened = wanted
+                    with self._cond:
+                        self._applied = version
+                        self._cond.notify_all()
+                    if reconnected:
+                        reconnected = False
+                        for channel in listened:
+                            self._dispatch(channel, None)
+
+                    self._drain()  # 执行 LISTEN 等语句时可能已收到通知, 先分发再等待
+                    if not selector.select(self._KEEPALIVE):
+                        with self._conn.cursor() as cursor:
+                            cursor.execute("SELECT 1")
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    self._drain()
+                except (psycopg2.Error, PoolError) as e:
+                    logger.warning("PostgreSQL 监听连接异常: %s, %s 秒后重连", e, self._RECONNECT_DELAY)
+                    with self._cond:
+                        self._error = e
+                        self._cond.notify_all()
+                    if fd is not None:
+                        selector.unregister(fd)
+                        fd = None
+                    if self._conn is not None:
+                        self._db.put_connection(self._conn, close=True)
+                        self._conn = None
+                    with self._cond:
+                        if not self._stopping:
+                            self._cond.wait(self._RECONNECT_DELAY)
+        finally:
+            selector.close()
+            self._wake_r.close()
+            self._wake_w.close()
+            if self._conn is not None:
+                self._db.put_connection(self._conn, close=True)
+                self._conn = None
+
+    def _drain(self):
+        """读取连接上已到达的通知并逐条分发"""
+        self._conn.poll()
+        while self._conn.notifies:
+            notify = self._conn.notifies.pop(0)
+            self._dispatch(notify.channel, notify.payload)
+
+    def _dispatch(self, channel: str, payload: Optional[str]):
+        """把通知分发给频道的全部回调, 回调异常只记录日志"""
+        with self._cond:
+            callbacks = list(self._callbacks.get(channel, []))
+        for callback in callbacks:
+            try:
+                callback(channel, payload)
+            except Exception:
+                logger.exception("处理 PostgreSQL 通知失败, 频道: %s", channel)
@@ -1,21 +1,33 @@
 # -*- coding: utf-8 -*-
 """SQL Server 数据库操作工具类, 提供连接管理、CRUD、事务、批量操作等功能
 
-封装 SQL Server 数据库的常用操作, 支持连接池管理、参数化查询防注入。
+封装 SQL Server 数据库的常用操作, 支持线程安全的连接池、参数化查询防注入。
 适用于 SQL Server 2016+ 版本。
 
 依赖安装:
     pip install pymssql        # SQL Server 驱动
 
+不兼容变更:
+    get_connection() 原先返回一个共享连接, 调用方无需归还; 现在从连接池借出独立连接,
+    必须调用 put_connection() 归还, 否则连接池会在 max_connections 次调用后耗尽并抛出 TimeoutError。
+    直接使用连接时推荐改为 with db.connection() as conn: ..., 退出代码块时自动归还。
+
 Usage:
     >>> from SQLServerUtils import SQLServerUtils
     >>> with SQLServerUtils(server="localhost", user="sa", password="xxx", database="test") as db:
     ...     result = db.query("SELECT * FROM users")
+    ...     with db.connection() as conn:
+    ...         with conn.cursor() as cursor:
+    ...             cursor.execute("SELECT 1")
 """
 # ------------ common ------------
+import threading
+from contextlib import contextmanager
+import time
 from typing import (
     Any,
     Dict,
+    Iterator,
     List,
     Optional,
     Tuple,
@@ -29,27 +41,26 @@ import pymssql
 class SQLServerUtils:
     """SQL Server 数据库操作工具类
 
-    提供连接管理、增删改查、批量操作和事务支持。
-    基于 pymssql 实现。
+    提供连接池管理、增删改查、批量操作和事务支持。
+    基于 pymssql + 连接池实现, 每次操作从连接池借出独立连接, 多线程可以并发访问。
 
     Usage:
         >>> db = SQLServerUtils(host="localhost", user="sa", password="xxx", database="test")
         >>> results = db.select("SELECT * FROM users WHERE age > %d", params=[18])
         >>> db.close()
     """
-    _conn = None  # 数据库连接
-    _host = ""  # 主机地址
-    _port = 0  # 端口
-    _user = ""  # 用户名
-    _password = ""  # 密码
-    _database = ""  # 数据库名
-    _config = {}  # 额外配置
+    _pool: Optional["_SQLServerPool"] = None  # 数据库连接池
+    _pool_timeout: Optional[float] = 30  # 等待空闲连接的默认最长时间(秒)
+    _autocommit = True  # 连接默认的自动提交设置
+    _local: Optional[threading.local] = None  # 线程本地存储, 保存当前线程事务固定使用的连接
 
     def __init__(self, host: str = "localhost", port: int = 1433,
                  user: str = "sa", password: str = "",
                  database: str = "", charset: str = "utf8",
-                 autocommit: bool = True, **kwargs):
-        """初始化 SQL Server 连接
+                 autocommit: bool = True, min_connections: int = 2,
+                 max_connections: int = 10, pool_timeout: Optional[float] = 30,
+                 max_lifetime: Optional[float] = 3600, validate_after: Optional[float] = 5, **kwargs):
+        """初始化 SQL Server 连接池
 
         Args:
             host (str): 数据库主机地址, 默认为 localhost
@@ -59,21 +70,29 @@ class SQLServerUtils:
             database (str): 数据库名
             charset (str): 字符集, 默认为 utf8
             autocommit (bool): 是否自动提交, 默认为 True
+            min_connections (int): 连接池最小连接数, 初始化时预先创建, 默认为 2
+            max_connections (int): 连接池最大连接数, 连接全部借出时后续请求排队等待, 默认为 10
+            pool_timeout (Optional[float]): 等待空闲连接的默认最长时间(秒), None 表示一直等待, 默认为 30
+            max_lifetime (Optional[float]): 连接最大存活时间(秒), 超过后在下次取出时重建,
+                None 表示不限制, 默认为 3600
+            validate_after (Optional[float]): 连接空闲超过该时间(秒)后, 取出时先执行 SELECT 1 检查,
+                失败则重建连接; 0 表示每次取出都检查, None 表示不检查, 默认为 5
             **kwargs: 传递给 pymssql.connect 的其他参数
 
         Example:
             >>> db = SQLServerUtils(host="localhost", user="sa", password="123456", database="test")
-            >>> db._conn is not None
+            >>> db._pool is not None
             True
             >>> db.close()
         """
-        self._host = host
-        self._port = port
-        self._user = user
-        self._password = password
-        self._database = database
-        self._config = kwargs
-        self._conn = pymssql.connect(
+        self._autocommit = autocommit
+        self._pool_timeout = pool_timeout
+        self._local = threading.local()
+        self._pool = _SQLServerPool(
+            min_connections=min_connections,
+            max_connections=max_connections,
+            max_lifetime=max_lifetime,
+            validate_after=validate_after,
             server=host,
             port=port,
             user=user,
@@ -86,34 +105,112 @@ class SQLServerUtils:
 
     # region ---------------------------- 连接管理 ----------------------------
 
-    def get_connection(self):
-        """获取当前数据库连接
+    def get_connection(self, timeout: Optional[float] = None):
+        """从连接池获取一个连接, 当前线程处于手动事务中时返回事务使用的连接
+
+        用完后必须调用 put_connection 归还, 推荐使用 connection() 上下文管理器自动归还。
+
+        Args:
+            timeout (Optional[float]): 最长等待时间(秒), 默认使用初始化时的 pool_timeout
 
         Returns:
             Connection: pymssql 连接对象
+
+        Raises:
+            TimeoutError: 等待空闲连接超时时抛出异常
+            RuntimeError: 连接池已关闭时抛出异常
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        return self._pool.getconn(timeout=self._pool_timeout if timeout is None else timeout)
+
+    def put_connection(self, conn, close: bool = False):
+        """将连接归还到连接池, 当前线程手动事务使用的连接在事务结束时才归还
+
+        Args:
+            conn: pymssql 连接对象
+            close (bool): 是否关闭连接而不是放回连接池, 默认为 False
+        """
+        if conn is getattr(self._local, "conn", None):
+            return
+        self._pool.putconn(conn, close=close)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """从连接池借出一个连接, 退出代码块时自动归还
+
+        未提交的修改在归还前回滚(autocommit=False 时需要在代码块内自行 commit);
+        代码块抛出异常且回滚失败时关闭该连接而不放回连接池。当前线程处于手动事务中时借出的是事务连接,
+        退出时不回滚也不归还。
+
+        Args:
+            timeout (Optional[float]): 最长等待时间(秒), 默认使用初始化时的 pool_timeout
+
+        Yields:
+            Connection: pymssql 连接对象
+
+        Raises:
+            TimeoutError: 等待空闲连接超时时抛出异常
+
+        Example:
+            >>> db = SQLServerUtils(host="localhost", user="sa", password="123456", database="test")
+            >>> with db.connection() as conn:
+            ...     with conn.cursor(as_dict=True) as cursor:
+            ...         cursor.execute("SELECT TOP 10 * FROM users")
+            ...         rows = cursor.fetchall()
+            >>> db.close()
         """
+        conn = self.get_connection(timeout)
+        broken = False
         try:
-            self._conn.ping()
-        except Exception:
-            self._conn = pymssql.connect(
-                server=self._host, port=self._port,
-                user=self._user, password=self._password,
-                database=self._database, **self._config
-            )
-        return self._conn
+            yield conn
+        except BaseException:
+            broken = not self._rollback(conn)
+            raise
+        else:
+            if not self._autocommit:
+                broken = not self._rollback(conn)
+        finally:
+            self.put_connection(conn, close=broken)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """获取连接池运行指标, 用于根据实际负载调整连接池大小
+
+        Returns:
+            Dict[str, Any]: 连接池指标, 包含:
+                - in_use: 当前借出的连接数
+                - idle: 池中空闲连接数
+                - max_connections: 最大连接数
+                - checkouts: 累计取出次数
+                - waits: 因连接全部借出而等待的次数
+                - wait_time: 累计等待时间(秒)
+                - max_wait_time: 单次最长等待时间(秒)
+                - timeouts: 等待超时次数
+                - wait_histogram: 取出连接耗时的分布, 键为桶上限(如 "<=10ms"), 值为次数
+                - validation_failures: 取出时检查失败而重建的次数
+                - recycled: 因超过 max_lifetime 而重建的次数
+
+        Example:
+            >>> db = SQLServerUtils(host="localhost", user="sa", password="123456", database="test")
+            >>> db.pool_stats()["idle"]
+            2
+            >>> db.close()
+        """
+        return self._pool.stats()
 
     def close(self):
-        """关闭数据库连接"""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        """关闭连接池, 释放所有连接资源"""
+        if self._pool:
+            self._pool.closeall()
+            self._pool = None
 
     def __enter__(self) -> "SQLServerUtils":
         """进入上下文管理器"""
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """退出上下文管理器, 自动关闭连接"""
+        """退出上下文管理器, 自动关闭连接池"""
         self.close()
 
     # endregion ---------------------------- 连接管理 ----------------------------
@@ -141,11 +238,19 @@ class SQLServerUtils:
             >>> db.close()
         """
         conn = self.get_connection()
-        with conn.cursor(as_dict=as_dict) as cursor:
-            cursor.execute(sql, params)
-            if size == -1:
-                return cursor.fetchall()
-            return cursor.fetchmany(size)
+        broken = False
+        try:
+            with conn.cursor(as_dict=as_dict) as cursor:
+                cursor.execute(sql, params)
+                rows = cursor.fetchall() if size == -1 else cursor.fetchmany(size)
+            if not self._autocommit:
+                broken = not self._rollback(conn)  # 结束查询隐式开启的事务, 避免带着事务归还连接
+            return rows
+        except Exception:
+            broken = not self._rollback(conn)
+            raise
+        finally:
+            self.put_connection(conn, close=broken)
 
     def select_one(self, sql: str, params: Optional[Union[List, Tuple, Dict]] = None,
                    as_dict: bool = True) -> Optional[Union[Dict[str, Any], Tuple]]:
@@ -165,9 +270,19 @@ class SQLServerUtils:
             >>> db.close()
         """
         conn = self.get_connection()
-        with conn.cursor(as_dict=as_dict) as cursor:
-            cursor.execute(sql, params)
-            return cursor.fetchone()
+        broken = False
+        try:
+            with conn.cursor(as_dict=as_dict) as cursor:
+                cursor.execute(sql, params)
+                row = cursor.fetchone()
+            if not self._autocommit:
+                broken = not self._rollback(conn)  # 结束查询隐式开启的事务, 避免带着事务归还连接
+            return row
+        except Exception:
+            broken = not self._rollback(conn)
+            raise
+        finally:
+            self.put_connection(conn, close=broken)
 
     # endregion ---------------------------- 查询操作 ----------------------------
 
@@ -189,10 +304,17 @@ class SQLServerUtils:
             >>> db.close()
         """
         conn = self.get_connection()
-        with conn.cursor() as cursor:
-            cursor.execute(sql, params)
-            conn.commit()
-            return cursor.rowcount
+        broken = False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                self._commit(conn)
+                return cursor.rowcount
+        except Exception:
+            broken = not self._rollback(conn)
+            raise
+        finally:
+            self.put_connection(conn, close=broken)
 
     def execute_many(self, sql: str, params_list: List[Union[List, Tuple, Dict]]) -> int:
         """批量执行 SQL
@@ -214,12 +336,19 @@ class SQLServerUtils:
         """
         conn = self.get_connection()
         total = 0
-        with conn.cursor() as cursor:
-            for params in params_list:
-                cursor.execute(sql, params)
-                total += cursor.rowcount
-            conn.commit()
-        return total
+        broken = False
+        try:
+            with conn.cursor() as cursor:
+                for params in params_list:
+                    cursor.execute(sql, params)
+                    total += cursor.rowcount
+                self._commit(conn)
+            return total
+        except Exception:
+            broken = not self._rollback(conn)
+            raise
+        finally:
+            self.put_connection(conn, close=broken)
 
     def insert(self, table: str, data: Dict[str, Any]) -> Optional[int]:
         """插入单条记录, 返回自增 ID(如有)
@@ -241,11 +370,18 @@ class SQLServerUtils:
         sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders}); SELECT SCOPE_IDENTITY()"
 
         conn = self.get_connection()
-        with conn.cursor() as cursor:
-            cursor.execute(sql, list(data.values()))
-            conn.commit()
-            identity = cursor.fetchone()
-            return int(identity[0]) if identity and identity[0] else None
+        broken = False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, list(data.values()))
+                identity = cursor.fetchone()
+                self._commit(conn)
+                return int(identity[0]) if identity and identity[0] else None
+        except Exception:
+            broken = not self._rollback(conn)
+            raise
+        finally:
+            self.put_connection(conn, close=broken)
 
     def insert_batch(self, table: str, data_list: List[Dict[str, Any]]) -> int:
         """批量插入多条记录
@@ -315,26 +451,100 @@ class SQLServerUtils:
         sql = f"DELETE FROM {table} WHERE {condition}"
         return self.execute(sql, condition_params)
 
+    def _commit(self, conn):
+        """提交写入, 当前线程处于手动事务中时留给 commit_transaction 提交
+
+        Args:
+            conn: pymssql 连接对象
+        """
+        if conn is not getattr(self._local, "conn", None):
+            conn.commit()
+
+    def _rollback(self, conn) -> bool:
+        """回滚借出连接上未结束的事务, 避免把它归还到连接池; 手动事务由调用方决定是否回滚
+
+        Args:
+            conn: pymssql 连接对象
+
+        Returns:
+            bool: 连接是否仍然可用, 回滚失败说明连接已断开, 应关闭而不是放回连接池
+        """
+        if conn is getattr(self._local, "conn", None):
+            return True
+        try:
+            conn.rollback()
+            return True
+        except pymssql.Error:
+            return False
+
     # endregion ---------------------------- 写入操作 ----------------------------
 
     # region ---------------------------- 事务操作 ----------------------------
 
     def begin_transaction(self):
-        """手动开始事务(关闭自动提交)"""
+        """手动开始事务(关闭自动提交)
+
+        从连接池借出一个连接并固定给当前线程, 直到 commit_transaction/rollback_transaction 才归还,
+        期间当前线程的所有操作都使用该连接, 其他线程不受影响。事务已开始时不做任何操作。
+
+        Raises:
+            TimeoutError: 等待空闲连接超时时抛出异常
+
+        Example:
+            >>> db = SQLServerUtils(host="localhost", user="sa", password="123456", database="test")
+            >>> db.begin_transaction()
+            >>> try:
+            ...     db.execute("UPDATE accounts SET balance = balance - %d WHERE id = %d", params=[100, 1])
+            ...     db.execute("UPDATE accounts SET balance = balance + %d WHERE id = %d", params=[100, 2])
+            ...     db.commit_transaction()
+            ... except Exception:
+            ...     db.rollback_transaction()
+            ...     raise
+            >>> db.close()
+        """
+        if getattr(self._local, "conn", None) is not None:
+            return
         conn = self.get_connection()
-        conn.autocommit(False)
+        try:
+            conn.autocommit(False)
+        except Exception:
+            self.put_connection(conn, close=True)
+            raise
+        self._local.conn = conn
 
     def commit_transaction(self):
-        """提交事务"""
-        conn = self.get_connection()
-        conn.commit()
-        conn.autocommit(True)
+        """提交事务并归还连接"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        try:
+            conn.commit()
+        finally:
+            self._end_transaction(conn)
 
     def rollback_transaction(self):
-        """回滚事务"""
-        conn = self.get_connection()
-        conn.rollback()
-        conn.autocommit(True)
+        """回滚事务并归还连接"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        try:
+            conn.rollback()
+        finally:
+            self._end_transaction(conn)
+
+    def _end_transaction(self, conn):
+        """解除当前线程的事务连接, 恢复自动提交设置后归还到连接池
+
+        Args:
+            conn: pymssql 连接对象
+        """
+        self._local.conn = None
+        try:
+            conn.autocommit(self._autocommit)
+            broken = False
+        except pymssql.Error:
+            broken = True
+        self.put_connection(conn, close=broken)
 
     # endregion ---------------------------- 事务操作 ----------------------------
 
@@ -368,3 +578,220 @@ class SQLServerUtils:
             WHERE TABLE_NAME = %s
             ORDER BY ORDINAL_POSITION
         """, params=[table])
+
+
+class _SQLServerPool:
+    """线程安全的 pymssql 连接池, 由 SQLServerUtils 创建
+
+    pymssql 连接不能在线程间共享, 每次操作借出独立连接; 连接全部借出时在条件变量上等待其他线程归还。
+    空闲连接按后进先出复用, 只有空闲超过 validate_after 的连接才在取出时执行 SELECT 1 检查,
+    超过 max_lifetime 的连接在取出时重建。新建连接在锁外进行, 不阻塞其他线程归还和取出。
+    """
+    _WAIT_BUCKETS = ((0.001, "<=1ms"), (0.01, "<=10ms"), (0.1, "<=100ms"), (1.0, "<=1s"),
+                     (10.0, "<=10s"), (float("inf"), ">10s"))  # 等待耗时直方图的桶
+    _max_connections = 10  # 最大连接数
+    _max_lifetime: Optional[float] = None  # 连接最大存活时间(秒)
+    _validate_after: Optional[float] = None  # 空闲超过该时间(秒)后取出时执行 SELECT 1 检查
+    _closed = False  # 连接池是否已关闭
+
+    def __init__(self, min_connections: int, max_connections: int, max_lifetime: Optional[float] = None,
+                 validate_after: Optional[float] = None, **kwargs):
+        """初始化连接池并预先创建 min_connections 个连接
+
+        Args:
+            min_connections (int): 最小连接数
+            max_connections (int): 最大连接数
+            max_lifetime (Optional[float]): 连接最大存活时间(秒), None 表示不限制
+            validate_after (Optional[float]): 空闲超过该时间(秒)后取出时执行 SELECT 1 检查, None 表示不检查
+            **kwargs: 传递给 pymssql.connect 的参数
+        """
+        self._max_connections = max_connections
+        self._max_lifetime = max_lifetime
+        self._validate_after = validate_after
+        self._kwargs = kwargs
+        self._lock = threading.Condition()
+        self._idle: List[Any] = []  # 空闲连接, 末尾为最近归还的连接
+        self._born: Dict[int, float] = {}  # id(连接) -> 创建时间
+        self._returned: Dict[int, float] = {}  # id(连接) -> 最近一次归还时间
+        self._size = 0  # 已创建(含正在创建)的连接数
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._timeouts = 0
+        self._validation_failures = 0
+        self._recycled = 0
+        self._histogram = {label: 0 for _, label in self._WAIT_BUCKETS}
+        try:
+            for _ in range(min(min_connections, max_connections)):
+                self._size += 1
+                conn = self._connect()
+                self._idle.append(conn)
+                self._returned[id(conn)] = time.monotonic()
+        except Exception:
+            self.closeall()
+            raise
+
+    def _connect(self):
+        """创建新连接并记录创建时间, 调用前需已占用 _size 中的一个名额"""
+        conn = pymssql.connect(**self._kwargs)
+        self._born[id(conn)] = time.monotonic()
+        return conn
+
+    def getconn(self, timeout: Optional[float] = None):
+        """取出一个连接, 没有空闲连接且已达上限时最多等待 timeout 秒
+
+        Args:
+            timeout (Optional[float]): 最长等待时间(秒), None 表示一直等待
+
+        Returns:
+            Connection: pymssql 连接对象
+
+        Raises:
+            TimeoutError: 等待超时时抛出异常
+            RuntimeError: 连接池已关闭时抛出异常
+        """
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        with self._lock:
+            waited = False
+            while not self._closed and not self._idle and self._size >= self._max_connections:
+                if not waited:
+                    waited = True
+                    self._waits += 1
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._timeouts += 1
+                    self._wait_time += time.monotonic() - start
+                    raise TimeoutError(f"等待数据库连接超时({timeout} 秒)")
+                self._lock.wait(remaining)
+            if self._closed:
+                raise RuntimeError("连接池已关闭")
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                self._size += 1
+            elapsed = time.monotonic() - start
+            self._checkouts += 1
+            if waited:
+                self._wait_time += elapsed
+                self._max_wait_time = max(self._max_wait_time, elapsed)
+            for limit, label in self._WAIT_BUCKETS:
+                if elapsed <= limit:
+                    self._histogram[label] += 1
+                    break
+
+        if conn is None:
+            try:
+                return self._connect()
+            except Exception:
+                self._release_slot()
+                raise
+        return self._check(conn)
+
+    def _check(self, conn):
+        """检查取出的连接, 检查失败或超过最大存活时间时重建
+
+        Args:
+            conn: pymssql 连接对象
+
+        Returns:
+            Connection: 可用的 pymssql 连接对象
+        """
+        now = time.monotonic()
+        if self._max_lifetime is not None and now - self._born.get(id(conn), now) >= self._max_lifetime:
+            with self._lock:
+                self._recycled += 1
+            return self._replace(conn)
+
+        idle = now - self._returned.get(id(conn), now)
+        if self._validate_after is not None and idle >= self._validate_after:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                    cursor.fetchall()
+            except pymssql.Error:
+                with self._lock:
+                    self._validation_failures += 1
+                return self._replace(conn)
+        return conn
+
+    def _replace(self, conn):
+        """关闭旧连接并用新连接替换, 连接名额保持不变
+
+        Args:
+            conn: 需要替换的 pymssql 连接对象
+
+        Returns:
+            Connection: 新的 pymssql 连接对象
+
+        Raises:
+            pymssql.OperationalError: 新连接创建失败时释放名额并抛出异常
+        """
+        self._discard(conn)
+        try:
+            return self._connect()
+        except Exception:
+            self._release_slot()
+            raise
+
+    def _discard(self, conn):
+        """关闭连接并清理其记录, 不释放连接名额"""
+        self._born.pop(id(conn), None)
+        self._returned.pop(id(conn), None)
+        try:
+            conn.close()
+        except pymssql.Error:
+            pass
+
+    def _release_slot(self):
+        """释放一个连接名额并唤醒一个等待中的线程"""
+        with self._lock:
+            self._size -= 1
+            self._lock.notify()
+
+    def putconn(self, conn, close: bool = False):
+        """归还连接并唤醒一个等待中的线程
+
+        Args:
+            conn: pymssql 连接对象
+            close (bool): 是否关闭连接而不是放回连接池
+        """
+        if close or self._closed:
+            self._discard(conn)
+            self._release_slot()
+            return
+        with self._lock:
+            self._returned[id(conn)] = time.monotonic()
+            self._idle.append(conn)
+            self._lock.notify()
+
+    def closeall(self):
+        """关闭所有空闲连接, 并唤醒所有等待中的线程(随后抛出 RuntimeError); 借出的连接在归还时关闭"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._lock.notify_all()
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """获取连接池运行指标
+
+        Returns:
+            Dict[str, Any]: 连接池指标, 字段说明见 SQLServerUtils.pool_stats()
+        """
+        with self._lock:
+            return {
+                "in_use": self._size - len(self._idle),
+                "idle": len(self._idle),
+                "max_connections": self._max_connections,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_time": self._wait_time,
+                "max_wait_time": self._max_wait_time,
+                "timeouts": self._timeouts,
+                "wait_histogram": dict(self._histogram),
+                "validation_failures": self._validation_failures,
+                "recycled": self._recycled,
+            }
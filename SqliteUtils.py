@@ -7,12 +7,33 @@
 功能:
     - 数据库连接管理(支持上下文管理器)
     - 参数化查询防 SQL 注入
-    - 单条/批量 CRUD 操作
+    - 单条/批量 CRUD 操作(批量插入支持分块事务与冲突处理)
     - 事务管理(commit/rollback)
+    - 性能配置档(WAL、mmap、页缓存等 PRAGMA 组合)
+    - 连接池模式(每线程只读连接 + 单写线程串行写入)
+    - 流式查询(分批读取大结果集, 内存占用恒定)
+    - 列式导出(查询结果直接构建为 Polars DataFrame / Arrow Table, 需安装 polars 或 pyarrow)
+    - 在线维护(在线备份、增量 VACUUM、ANALYZE、PRAGMA optimize)
+    - 语句耗时钩子(query_hook)与 logging 日志, 不再向标准输出打印
+    - 索引诊断(记录执行过的查询, 基于 EXPLAIN QUERY PLAN 发现全表扫描并给出建索引语句)
 """
+import logging
 import os
+import queue
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+from itertools import chain, islice
+from urllib.parse import quote
 from typing import (
     Any,
+    Callable,
+    Iterable,
+    Iterator,
     List, 
     Dict, 
     Optional, 
@@ -24,6 +45,8 @@ from typing import (
 import sqlite3
 from sqlite3 import Connection, Cursor
 
+logger = logging.getLogger(__name__)
+
 
 class SqliteUtils:
     """SQLite 数据库工具类
@@ -35,27 +58,126 @@ class SqliteUtils:
     4. 数据插入、更新、删除
     5. 事务管理
     6. 表结构操作
+    7. 在线备份与维护
+    8. 索引诊断
     
     Attributes:
         db_path (str): 数据库文件路径
         conn (Connection): SQLite 连接对象
         cursor (Cursor): SQLite 游标对象
+        profile (Optional[Dict[str, Any]]): 连接时应用的性能配置档 PRAGMA
+        pooled (bool): 是否启用连接池模式
+        query_hook (Optional[Callable[[Dict[str, Any]], None]]): 每条语句执行后的回调
+        diagnostics (bool): 是否记录执行过的查询用于索引诊断
     """
+    # 预置性能配置档, 连接建立后按顺序执行对应的 PRAGMA
+    PROFILES: Dict[str, Dict[str, Any]] = {
+        # 通用场景: WAL + NORMAL 同步, 64MB 页缓存, 256MB 内存映射
+        "balanced": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -64000,
+            "mmap_size": 268435456,
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,
+        },
+        # 批量导入: 关闭同步刷盘, 加大页缓存, 崩溃时可能丢失最近提交的事务
+        "bulk_load": {
+            "journal_mode": "WAL",
+            "synchronous": "OFF",
+            "cache_size": -256000,
+            "mmap_size": 268435456,
+            "temp_store": "MEMORY",
+            "busy_timeout": 10000,
+        },
+        # 读多写少: 1GB 内存映射, 128MB 页缓存
+        "read_heavy": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -128000,
+            "mmap_size": 1073741824,
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,
+        },
+    }
+    
+    # 连接池模式下路由到只读连接的语句前缀, 其余语句一律交给写线程
+    _READ_PREFIXES: Tuple[str, ...] = ("SELECT", "WITH", "EXPLAIN", "VALUES")
+    # 传给 query_hook 和日志的 SQL 最大长度, 超出部分截断
+    _SQL_PREVIEW_LENGTH: int = 200
+    # 诊断模式下记录的语句类型, 只有这些语句的执行计划会受索引影响
+    _DIAGNOSTIC_PREFIXES: Tuple[str, ...] = ("SELECT", "WITH", "UPDATE", "DELETE")
+    # 诊断模式下最多记录的不同语句数, 超出时淘汰最久未执行的语句
+    _DIAGNOSTIC_MAX_QUERIES: int = 1000
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, profile: Union[str, Dict[str, Any], None] = None,
+                 pooled: bool = False, cached_statements: int = 128,
+                 query_hook: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 diagnostics: bool = False):
         """初始化 SqliteUtils 实例
         
         Args:
             db_path (str): SQLite 数据库文件路径, 如果文件不存在会自动创建
+            profile (Union[str, Dict[str, Any], None]): 性能配置档, 可以是 PROFILES 中的名称
+                ("balanced"、"bulk_load"、"read_heavy"), 也可以是自定义的 {pragma: value} 字典,
+                为 None 时不修改 SQLite 默认设置
+            pooled (bool): 是否启用连接池模式, 默认为 False。启用后每个线程使用独立的只读连接查询,
+                所有写操作通过队列交给唯一的写线程串行执行并逐条提交, 可在 ThreadPoolExecutor 中共享
+                同一实例。未指定 profile 时自动使用 "balanced"(WAL), 不支持 :memory: 数据库
+            cached_statements (int): 每个连接缓存的预编译语句数量(sqlite3 的 cached_statements), 默认为 128,
+                热点循环中涉及的不同 SQL 较多时可以调大, 避免语句被挤出缓存后重新解析
+            query_hook (Optional[Callable[[Dict[str, Any]], None]]): 语句耗时回调, 默认为 None。
+                每条 execute/execute_many 语句执行后(无论成功失败)以字典调用, 包含 sql(截断后的 SQL)、
+                duration(秒)、rowcount、many(是否批量执行)、error(失败时的异常, 成功为 None)。
+                查询语句的耗时只包含执行到第一行结果为止; 连接池模式下可能在写线程中被调用, 需保证线程安全
+            diagnostics (bool): 是否开启索引诊断, 默认为 False。开启后 execute 会记录每条不同的
+                SELECT/UPDATE/DELETE 语句(及首次出现时的参数), 供 advise_indexes() 分析。
+                最多保留 _DIAGNOSTIC_MAX_QUERIES 条, 超出时淘汰最久未执行的语句
+            
+        Raises:
+            ValueError: 配置档名称不存在时抛出异常
             
         Example:
             >>> db = SqliteUtils('test.db')
             >>> print(db.db_path)
             >>> 'test.db'
+            >>> db = SqliteUtils('test.db', profile='bulk_load')
+            >>> db = SqliteUtils('test.db', pooled=True)
+            >>> slow = lambda event: event['duration'] > 0.1 and print(event['sql'], event['duration'])
+            >>> db = SqliteUtils('test.db', query_hook=slow)
+            >>> db = SqliteUtils('test.db', diagnostics=True)
         """
         self.db_path = db_path
         self.conn: Optional[Connection] = None
         self.cursor: Optional[Cursor] = None
+        self.pooled = pooled
+        self.cached_statements = cached_statements
+        self.query_hook = query_hook
+        self.diagnostics = diagnostics
+        # 诊断模式记录的 SQL 及其参数, 按最近执行顺序排列
+        self._recorded_queries: "OrderedDict[str, Union[Tuple, Dict, None]]" = OrderedDict()
+        self._recorded_lock = threading.Lock()  # 连接池模式下多个线程会同时记录
+        self._writer: Optional[_SqliteWriter] = None  # 连接池模式的写线程
+        self._local = threading.local()  # 连接池模式下每个线程的只读连接
+        self._readers: List[Connection] = []  # 已创建的只读连接, 断开时统一关闭
+        self._readers_lock = threading.RLock()  # 线程退出时的回收可能由同一线程的垃圾回收触发, 需可重入
+        self.last_insert_stats: Dict[str, Any] = {}  # 最近一次 insert_many 的统计信息
+        self._manual_transaction = False  # 是否处于 begin_transaction() 开启的事务中
+        
+        if pooled:
+            if db_path == ":memory:":
+                raise ValueError("连接池模式不支持内存数据库")
+            if profile is None:
+                profile = "balanced"
+        
+        if isinstance(profile, str):
+            if profile not in self.PROFILES:
+                raise ValueError(f"未知的性能配置档: {profile}, 可选值: {list(self.PROFILES)}")
+            self.profile_name: Optional[str] = profile
+            self.profile: Optional[Dict[str, Any]] = dict(self.PROFILES[profile])
+        else:
+            self.profile_name = "custom" if profile else None
+            self.profile = dict(profile) if profile else None
         
     def connect(self) -> None:
         """连接到 SQLite 数据库
@@ -77,19 +199,157 @@ class SqliteUtils:
             if db_dir and not os.path.exists(db_dir):
                 os.makedirs(db_dir)
             
-            # 连接到数据库
-            self.conn = sqlite3.connect(self.db_path)
+            # 连接到数据库, 连接池模式下该连接只由写线程使用
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=not self.pooled,
+                                        cached_statements=self.cached_statements)
             self.cursor = self.conn.cursor()
             
             # 启用外键约束
             self.cursor.execute("PRAGMA foreign_keys = ON")
             
-            print(f"成功连接到数据库: {self.db_path}")
+            # 应用性能配置档
+            if self.profile:
+                self._apply_profile(self.conn)
+            
+            if self.pooled:
+                self._writer = _SqliteWriter(self.conn)
+            
+            logger.debug("成功连接到数据库: %s", self.db_path)
             
         except sqlite3.Error as e:
-            print(f"数据库连接失败: {e}")
+            logger.error("数据库连接失败: %s, 数据库: %s", e, self.db_path)
             raise
     
+    def _apply_profile(self, conn: Connection) -> None:
+        """在指定连接上执行性能配置档中的 PRAGMA
+        
+        page_size、auto_vacuum 只能在数据库写入内容前修改, 因此最先设置; 随后切换 journal_mode,
+        因为 WAL 的切换需要在其他 PRAGMA 之前完成。
+        
+        Args:
+            conn (Connection): SQLite 连接对象
+        """
+        order = {"page_size": 0, "auto_vacuum": 1, "journal_mode": 2}
+        pragmas = sorted(self.profile.items(), key=lambda item: order.get(item[0], 3))
+        for name, value in pragmas:
+            conn.execute(f"PRAGMA {name} = {value}")
+    
+    def _get_reader(self) -> Connection:
+        """获取当前线程的只读连接(连接池模式)
+        
+        每个线程首次调用时以 URI mode=ro 打开新连接, 并应用配置档中连接级别的 PRAGMA
+        (page_size、auto_vacuum、journal_mode 属于数据库文件, 已由写连接设置)。
+        连接挂在线程局部的 _ReaderSlot 上, 线程退出时槽位被回收, 连接随之关闭并移出 _readers,
+        避免短生命周期线程不断累积连接。
+        
+        Returns:
+            Connection: 当前线程专用的只读连接
+        """
+        slot = getattr(self._local, "slot", None)
+        if slot is None:
+            slot = _ReaderSlot(self._open_reader())
+            weakref.finalize(slot, _release_reader, self._readers, self._readers_lock, slot.conn)
+            with self._readers_lock:
+                self._readers.append(slot.conn)
+            self._local.slot = slot
+        return slot.conn
+    
+    def _open_reader(self) -> Connection:
+        """以 URI mode=ro 打开一个新的只读连接(连接池模式)
+        
+        Returns:
+            Connection: 只读连接
+        """
+        if not self._writer:
+            raise sqlite3.Error("数据库未连接, 请先调用 connect() 方法")
+        uri = f"file:{quote(os.path.abspath(self.db_path))}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                               cached_statements=self.cached_statements)
+        for name, value in self.profile.items():
+            if name not in ("page_size", "auto_vacuum", "journal_mode"):
+                conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+    
+    def _read_connection(self) -> Connection:
+        """获取用于查询的连接, 连接池模式下为当前线程的只读连接, 否则为主连接
+        
+        Returns:
+            Connection: SQLite 连接对象
+            
+        Raises:
+            sqlite3.Error: 数据库未连接时抛出异常
+        """
+        if self.pooled:
+            return self._get_reader()
+        if not self.conn:
+            raise sqlite3.Error("数据库未连接, 请先调用 connect() 方法")
+        return self.conn
+    
+    def _is_read_sql(self, sql: str) -> bool:
+        """判断语句在连接池模式下是否可以走只读连接
+        
+        不带赋值的 PRAGMA 视为读操作; WITH 开头的语句视为查询, 如需 CTE 写入请改用 INSERT ... SELECT。
+        
+        Args:
+            sql (str): SQL 语句
+            
+        Returns:
+            bool: 是否为只读语句
+        """
+        parts = sql.lstrip().split(None, 1)
+        if not parts:
+            return False
+        keyword = parts[0].upper()
+        if keyword == "PRAGMA":
+            return "=" not in sql
+        return keyword in self._READ_PREFIXES
+    
+    def _commit(self) -> None:
+        """提交辅助方法产生的修改
+        
+        连接池模式下写线程已逐条提交; 处于 begin_transaction() 开启的事务中时由调用方统一提交。
+        """
+        if not self.pooled and not self._manual_transaction:
+            self.conn.commit()
+    
+    def get_profile(self) -> Dict[str, Any]:
+        """获取当前连接实际生效的性能配置
+        
+        从数据库读取各 PRAGMA 的当前值, 而不是返回构造时传入的配置,
+        因此可以发现未生效的设置(例如内存数据库无法切换到 WAL)。连接池模式下读取的是写连接的配置。
+        
+        Returns:
+            Dict[str, Any]: 配置档名称及各 PRAGMA 的实际值
+            
+        Raises:
+            sqlite3.Error: 数据库未连接时抛出异常
+            
+        Example:
+            >>> db = SqliteUtils('test.db', profile='balanced')
+            >>> db.connect()
+            >>> print(db.get_profile())
+            >>> {'name': 'balanced', 'journal_mode': 'wal', 'synchronous': 1, ...}
+            >>> db.disconnect()
+        """
+        if not self.conn:
+            raise sqlite3.Error("数据库未连接, 请先调用 connect() 方法")
+        
+        names = ["journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout"]
+        if self.profile:
+            names += [name for name in self.profile if name not in names]
+        
+        def read(conn: Connection) -> Dict[str, Any]:
+            settings: Dict[str, Any] = {"name": self.profile_name}
+            for name in names:
+                row = conn.execute(f"PRAGMA {name}").fetchone()
+                settings[name] = row[0] if row else None
+            return settings
+        
+        # 连接池模式下写连接归写线程所有, 交给写线程读取
+        if self.pooled and self._writer:
+            return self._writer.submit(read)
+        return read(self.conn)
+    
     def disconnect(self) -> None:
         """断开数据库连接
         
@@ -102,6 +362,16 @@ class SqliteUtils:
             >>> print(db.conn is None)
             >>> True
         """
+        with self._readers_lock:
+            readers = list(self._readers)
+            self._readers.clear()
+        for reader in readers:
+            reader.close()
+        self._local = threading.local()
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        
         if self.cursor:
             self.cursor.close()
         if self.conn:
@@ -109,7 +379,8 @@ class SqliteUtils:
         
         self.cursor = None
         self.conn = None
-        print(f"已断开数据库连接: {self.db_path}")
+        self._manual_transaction = False
+        logger.debug("已断开数据库连接: %s", self.db_path)
     
     def execute(self, sql: str, params: Union[Tuple, Dict, None] = None) -> Cursor:
         """执行 SQL 语句
@@ -121,7 +392,8 @@ class SqliteUtils:
             params (Union[Tuple, Dict, None]): SQL 参数, 可以是元组或字典
             
         Returns:
-            Cursor: 执行后的游标对象
+            Cursor: 执行后的游标对象; 连接池模式下的写语句在写线程中读完结果(如 RETURNING)后提交,
+                返回只读的结果快照, 提供 rowcount、lastrowid、description 和 fetch 系列方法
             
         Raises:
             sqlite3.Error: SQL 执行失败时抛出异常
@@ -137,22 +409,49 @@ class SqliteUtils:
             >>> db.execute(sql, ('Alice',))
             >>> db.disconnect()
         """
+        if self.diagnostics:
+            self._record_query(sql, params)
+        
+        if self.pooled:
+            if self._is_read_sql(sql):
+                return self._execute_on(self._get_reader().cursor(), sql, params)
+            if not self._writer:
+                raise sqlite3.Error("数据库未连接, 请先调用 connect() 方法")
+            return self._writer.submit(lambda conn: _WriteResult(self._execute_on(conn.cursor(), sql, params)))
+        
         if not self.conn or not self.cursor:
             raise sqlite3.Error("数据库未连接, 请先调用 connect() 方法")
         
+        return self._execute_on(self.cursor, sql, params)
+    
+    def _execute_on(self, cursor: Cursor, sql: str, params: Union[Tuple, Dict, None] = None) -> Cursor:
+        """在指定游标上执行 SQL 语句
+        
+        Args:
+            cursor (Cursor): 执行语句的游标
+            sql (str): 要执行的 SQL 语句
+            params (Union[Tuple, Dict, None]): SQL 参数
+            
+        Returns:
+            Cursor: 执行后的游标对象
+        """
+        hook = self.query_hook
+        start = time.perf_counter() if hook else 0.0
         try:
             if params:
-                self.cursor.execute(sql, params)
+                cursor.execute(sql, params)
             else:
-                self.cursor.execute(sql)
-            
-            return self.cursor
+                cursor.execute(sql)
             
         except sqlite3.Error as e:
-            print(f"SQL 执行失败: {e}")
-            print(f"SQL: {sql}")
-            print(f"参数: {params}")
+            logger.error("SQL 执行失败: %s, SQL: %s", e, self._preview_sql(sql))
+            if hook:
+                self._emit_query_event(hook, sql, start, -1, False, e)
             raise
+        
+        if hook:
+            self._emit_query_event(hook, sql, start, cursor.rowcount, False, None)
+        return cursor
     
     def execute_many(self, sql: str, params_list: List[Union[Tuple, Dict]]) -> Cursor:
         """批量执行 SQL 语句
@@ -164,7 +463,7 @@ class SqliteUtils:
             params_list (List[Union[Tuple, Dict]]): 参数列表, 每个元素是一组参数
             
         Returns:
-            Cursor: 执行后的游标对象
+            Cursor: 执行后的游标对象; 连接池模式下返回写线程读取完毕的结果快照
             
         Raises:
             sqlite3.Error: SQL 执行失败时抛出异常
@@ -177,18 +476,105 @@ class SqliteUtils:
             >>> db.execute_many(sql, params_list)
             >>> db.disconnect()
         """
+        if self.pooled:
+            if not self._writer:
+                raise sqlite3.Error("数据库未连接, 请先调用 connect() 方法")
+            return self._writer.submit(lambda conn: _WriteResult(self._execute_many_on(conn.cursor(), sql, params_list)))
+        
         if not self.conn or not self.cursor:
             raise sqlite3.Error("数据库未连接, 请先调用 connect() 方法")
         
+        return self._execute_many_on(self.cursor, sql, params_list)
+    
+    def _execute_many_on(self, cursor: Cursor, sql: str, params_list: List[Union[Tuple, Dict]]) -> Cursor:
+        """在指定游标上批量执行 SQL 语句
+        
+        Args:
+            cursor (Cursor): 执行语句的游标
+            sql (str): 要执行的 SQL 语句
+            params_list (List[Union[Tuple, Dict]]): 参数列表
+            
+        Returns:
+            Cursor: 执行后的游标对象
+        """
+        hook = self.query_hook
+        start = time.perf_counter() if hook else 0.0
         try:
-            self.cursor.executemany(sql, params_list)
-            return self.cursor
+            cursor.executemany(sql, params_list)
             
         except sqlite3.Error as e:
-            print(f"SQL 批量执行失败: {e}")
-            print(f"SQL: {sql}")
-            print(f"参数列表: {params_list}")
+            # 不记录参数列表, 批量参数可能多达数百万组
+            logger.error("SQL 批量执行失败: %s, SQL: %s", e, self._preview_sql(sql))
+            if hook:
+                self._emit_query_event(hook, sql, start, -1, True, e)
             raise
+        
+        if hook:
+            self._emit_query_event(hook, sql, start, cursor.rowcount, True, None)
+        return cursor
+    
+    def _preview_sql(self, sql: str) -> str:
+        """截断过长的 SQL, 用于日志和 query_hook
+        
+        Args:
+            sql (str): SQL 语句
+            
+        Returns:
+            str: 最多 _SQL_PREVIEW_LENGTH 个字符的 SQL
+        """
+        if len(sql) <= self._SQL_PREVIEW_LENGTH:
+            return sql
+        return sql[:self._SQL_PREVIEW_LENGTH] + "..."
+    
+    def _emit_query_event(self, hook: Callable[[Dict[str, Any]], None], sql: str, start: float,
+                          rowcount: int, many: bool, error: Optional[Exception]) -> None:
+        """调用 query_hook, 回调自身抛出的异常只记录日志, 不影响 SQL 执行结果
+        
+        Args:
+            hook (Callable[[Dict[str, Any]], None]): 回调函数
+            sql (str): SQL 语句
+            start (float): 开始执行时的 time.perf_counter() 值
+            rowcount (int): 影响的行数, 查询或失败时为 -1
+            many (bool): 是否为批量执行
+            error (Optional[Exception]): 执行失败时的异常
+        """
+        event = {
+            "sql": self._preview_sql(sql),
+            "duration": time.perf_counter() - start,
+            "rowcount": rowcount,
+            "many": many,
+            "error": error,
+        }
+        try:
+            hook(event)
+        except Exception:
+            logger.exception("query_hook 执行失败")
+    
+    def _execute_maintenance(self, sql: str) -> None:
+        """在写连接上完整执行维护语句
+        
+        incremental_vacuum 等 PRAGMA 每一步只处理一页, 而 Cursor.execute 对不返回列的语句只执行一步,
+        因此使用 executescript 执行到结束(会先提交当前未提交的事务)。连接池模式下交给写线程执行,
+        避免被路由到只读连接。
+        
+        Args:
+            sql (str): 维护语句
+            
+        Raises:
+            sqlite3.ProgrammingError: 处于 begin_transaction() 开启的事务中时抛出异常,
+                executescript 会提交该事务, 之后的 rollback_transaction() 将无法撤销
+        """
+        if self._manual_transaction:
+            raise sqlite3.ProgrammingError("维护语句会提交当前事务, 请先调用 commit_transaction() 或 rollback_transaction()")
+        if self.pooled:
+            if not self._writer:
+                raise sqlite3.Error("数据库未连接, 请先调用 connect() 方法")
+            self._writer.submit(lambda conn: conn.executescript(sql))
+            return
+        
+        if not self.conn:
+            raise sqlite3.Error("数据库未连接, 请先调用 connect() 方法")
+        self.conn.executescript(sql)
     
     def fetch_one(self, sql: str, params: Union[Tuple, Dict, None] = None) -> Optional[Tuple]:
         """查询单条记录
@@ -263,6 +649,196 @@ class SqliteUtils:
         cursor = self.execute(sql, params)
         return cursor.fetchmany(size)
     
+    def iter_query(self, sql: str, params: Union[Tuple, Dict, None] = None, batch_size: int = 1000,
+                   as_dict: bool = False, yield_batches: bool = False) -> Iterator[Union[Tuple, Dict[str, Any], List]]:
+        """流式查询记录
+        
+        在独立游标上执行查询, 通过 fetchmany 每次只从 SQLite 读取 batch_size 行,
+        适合全表导出等大结果集场景, 内存占用与结果集大小无关。
+        生成器结束或被提前关闭(break、close())时会自动关闭游标。
+        
+        Args:
+            sql (str): 查询 SQL 语句
+            params (Union[Tuple, Dict, None]): SQL 参数
+            batch_size (int): 每次 fetchmany 读取的行数(游标 arraysize), 默认为 1000
+            as_dict (bool): 是否以字典形式返回每行, 默认为 False
+            yield_batches (bool): 是否按批返回(每次产出一个行列表), 默认为 False 逐行返回
+            
+        Yields:
+            Union[Tuple, Dict[str, Any], List]: 单行记录, 或 yield_batches=True 时的一批记录
+            
+        Raises:
+            sqlite3.Error: 数据库未连接或 SQL 执行失败时抛出异常
+            
+        Example:
+            >>> db = SqliteUtils('test.db')
+            >>> db.connect()
+            >>> for row in db.iter_query("SELECT * FROM users", as_dict=True):
+            >>>     print(row['name'])
+            >>> for batch in db.iter_query("SELECT * FROM users", batch_size=5000, yield_batches=True):
+            >>>     print(len(batch))
+            >>> db.disconnect()
+        """
+        cursor = self._execute_on(self._read_connection().cursor(), sql, params)
+        cursor.arraysize = batch_size
+        try:
+            if as_dict and cursor.description:
+                # 列名只计算一次, 每行直接 zip 成字典
+                names = tuple(column[0] for column in cursor.description)
+                cursor.row_factory = lambda _, row: dict(zip(names, row))
+            
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                if yield_batches:
+                    yield rows
+                else:
+                    yield from rows
+        finally:
+            cursor.close()
+    
+    def fetch_columnar(self, sql: str, params: Union[Tuple, Dict, None] = None, batch_size: int = 10000,
+                       output: str = "polars", stream: bool = False) -> Any:
+        """以列式结构返回查询结果
+        
+        按 batch_size 从游标分批读取, 每批直接转置追加到各列的列表中, 最后一次性构建
+        Polars DataFrame 或 Arrow Table, 省去 行元组 -> 字典 -> DataFrame 的中间转换。
+        结果集很大时可以设置 stream=True, 每批单独构建一个 DataFrame/Table 并逐个返回。
+        
+        依赖安装:
+            pip install polars     # output="polars"
+            pip install pyarrow    # output="arrow"
+        
+        Args:
+            sql (str): 查询 SQL 语句
+            params (Union[Tuple, Dict, None]): SQL 参数
+            batch_size (int): 每次从游标读取的行数, stream=True 时也是每个批次的行数, 默认为 10000
+            output (str): 输出格式, "polars" 返回 polars.DataFrame, "arrow" 返回 pyarrow.Table, 默认为 "polars"
+            stream (bool): 是否以生成器形式逐批返回, 默认为 False
+            
+        Returns:
+            Any: polars.DataFrame / pyarrow.Table, stream=True 时为逐批产出它们的生成器
+            
+        Raises:
+            ValueError: output 取值无效时抛出异常
+            
+        Example:
+            >>> db = SqliteUtils('test.db')
+            >>> db.connect()
+            >>> df = db.fetch_columnar("SELECT * FROM users WHERE age > ?", (18,))
+            >>> print(df.shape)
+            >>> for table in db.fetch_columnar("SELECT * FROM logs", output='arrow', stream=True):
+            >>>     print(table.num_rows)
+            >>> db.disconnect()
+        """
+        if output not in ("polars", "arrow"):
+            raise ValueError(f"无效的 output: {output}, 可选值: 'polars'、'arrow'")
+        if stream:
+            return self._iter_columnar(sql, params, batch_size, output)
+        
+        cursor = self._execute_on(self._read_connection().cursor(), sql, params)
+        try:
+            names = [column[0] for column in cursor.description or ()]
+            columns: List[List[Any]] = [[] for _ in names]
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                # 整批转置后按列追加, 避免逐行逐字段处理
+                for values, column in zip(zip(*rows), columns):
+                    column.extend(values)
+        finally:
+            cursor.close()
+        return self._build_columnar(names, columns, output)
+    
+    def _iter_columnar(self, sql: str, params: Union[Tuple, Dict, None], batch_size: int,
+                       output: str) -> Iterator[Any]:
+        """逐批产出列式结果, 由 fetch_columnar(stream=True) 使用
+        
+        Args:
+            sql (str): 查询 SQL 语句
+            params (Union[Tuple, Dict, None]): SQL 参数
+            batch_size (int): 每批行数
+            output (str): 输出格式, "polars" 或 "arrow"
+            
+        Yields:
+            Any: 每批对应的 polars.DataFrame 或 pyarrow.Table
+        """
+        cursor = self._execute_on(self._read_connection().cursor(), sql, params)
+        try:
+            names = [column[0] for column in cursor.description or ()]
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield self._build_columnar(names, [list(values) for values in zip(*rows)], output)
+        finally:
+            cursor.close()
+    
+    @staticmethod
+    def _build_columnar(names: List[str], columns: List[List[Any]], output: str) -> Any:
+        """根据列名和列数据构建 DataFrame 或 Arrow Table
+        
+        重复的列名(如 SELECT a.id, b.id)依次改名为 id、id_1、id_2……, 不会丢列。
+        SQLite 为动态类型, 同一列可能混有不同类型, 两种输出按相同规则推断公共类型:
+        整数与浮点数混合时为浮点数, 其他混合类型转为字符串。
+        
+        Args:
+            names (List[str]): 列名
+            columns (List[List[Any]]): 与列名一一对应的列数据
+            output (str): 输出格式, "polars" 或 "arrow"
+            
+        Returns:
+            Any: polars.DataFrame 或 pyarrow.Table
+        """
+        original = set(names)
+        used = set()
+        unique: List[str] = []
+        for name in names:
+            candidate, suffix = name, 0
+            # 生成的名字也不能与查询中原有的列名冲突
+            while candidate in used or (suffix and candidate in original):
+                suffix += 1
+                candidate = f"{name}_{suffix}"
+            used.add(candidate)
+            unique.append(candidate)
+        
+        if output == "arrow":
+            import pyarrow as pa
+            arrays = []
+            for values in columns:
+                try:
+                    arrays.append(pa.array(values))
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    arrays.append(pa.array(SqliteUtils._common_type(values)))
+            return pa.table(arrays, names=unique)
+        
+        import polars as pl
+        data = {}
+        for name, values in zip(unique, columns):
+            try:
+                data[name] = pl.Series(name, values)
+            except (TypeError, pl.exceptions.PolarsError):
+                data[name] = pl.Series(name, SqliteUtils._common_type(values))
+        return pl.DataFrame(data)
+    
+    @staticmethod
+    def _common_type(values: List[Any]) -> List[Any]:
+        """把混合类型的列转换为公共类型: 只含整数和浮点数时转为浮点数, 否则转为字符串
+        
+        Args:
+            values (List[Any]): 列数据
+            
+        Returns:
+            List[Any]: 转换后的列数据, None 保持不变
+        """
+        if all(value is None or (isinstance(value, (int, float)) and not isinstance(value, bool))
+               for value in values):
+            return [None if value is None else float(value) for value in values]
+        return [None if value is None else value.hex() if isinstance(value, bytes) else str(value)
+                for value in values]
+    
     def insert(self, table: str, data: Dict[str, Any]) -> int:
         """插入单条记录
         
@@ -283,26 +859,43 @@ class SqliteUtils:
             >>> print(f"插入记录的 ID: {row_id}")
             >>> db.disconnect()
         """
-        # 构建 SQL 语句
-        columns = ', '.join(data.keys())
-        placeholders = ', '.join(['?' for _ in data])
-        sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+        # 构建 SQL 语句(按表名和列名元组缓存)
+        sql = self._build_insert_sql(table, tuple(data))
         
         # 执行插入
-        self.execute(sql, tuple(data.values()))
-        self.conn.commit()
+        cursor = self.execute(sql, tuple(data.values()))
+        self._commit()
         
         # 返回最后插入的 ID
-        return self.cursor.lastrowid
+        return cursor.lastrowid
     
-    def insert_many(self, table: str, data_list: List[Dict[str, Any]]) -> None:
+    def insert_many(self, table: str, data_list: Iterable[Dict[str, Any]], chunk_size: int = 5000,
+                    on_conflict: Optional[str] = None, conflict_columns: Optional[List[str]] = None,
+                    update_columns: Optional[List[str]] = None) -> List[int]:
         """批量插入记录
         
-        向指定表中批量插入多条记录。
+        向指定表中批量插入多条记录。数据按 chunk_size 分块, 每块在一个显式事务中写入并提交,
+        支持列表、生成器等任意可迭代对象, 内存中最多只保留一个分块的数据。
+        如果调用前已通过 begin_transaction() 开启事务, 则所有分块并入该事务, 不单独提交。
+        列名以第一条记录的键为准, 后续记录缺少的列按 NULL 插入。
         
         Args:
             table (str): 表名
-            data_list (List[Dict[str, Any]]): 要插入的数据列表
+            data_list (Iterable[Dict[str, Any]]): 要插入的数据, 可以是列表或生成器
+            chunk_size (int): 每个事务写入的行数, 默认为 5000
+            on_conflict (Optional[str]): 冲突处理方式, 默认为 None(冲突时抛出异常)
+                - "ignore": INSERT OR IGNORE, 跳过冲突行
+                - "replace": INSERT OR REPLACE, 删除旧行后插入
+                - "update": INSERT ... ON CONFLICT (conflict_columns) DO UPDATE, 需要 SQLite 3.24+
+            conflict_columns (Optional[List[str]]): on_conflict="update" 时的冲突列(主键或唯一索引列)
+            update_columns (Optional[List[str]]): on_conflict="update" 时需要更新的列, 默认为除冲突列外的所有列
+            
+        Returns:
+            List[int]: 每个分块实际写入(插入或更新)的行数
+            
+        Raises:
+            ValueError: on_conflict 取值无效或缺少 conflict_columns 时抛出异常
+            sqlite3.Error: SQL 执行失败时抛出异常, 失败的分块会被回滚, 之前的分块已提交
             
         Example:
             >>> db = SqliteUtils('test.db')
@@ -313,22 +906,144 @@ class SqliteUtils:
             >>>     {'name': 'Charlie', 'age': 35}
             >>> ]
             >>> db.insert_many('users', data_list)
+            >>> [3]
+            >>> rows = ({'id': i, 'name': f'user{i}'} for i in range(1000000))
+            >>> counts = db.insert_many('users', rows, chunk_size=10000,
+            >>>                         on_conflict='update', conflict_columns=['id'])
+            >>> print(db.last_insert_stats['rows_per_sec'])
             >>> db.disconnect()
         """
-        if not data_list:
-            return
+        iterator = iter(data_list)
+        first = next(iterator, None)
+        if first is None:
+            self.last_insert_stats = {"rows": 0, "chunks": 0, "seconds": 0.0, "rows_per_sec": 0.0}
+            return []
         
         # 构建 SQL 语句
-        columns = ', '.join(data_list[0].keys())
-        placeholders = ', '.join(['?' for _ in data_list[0]])
-        sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+        columns = tuple(first.keys())
+        sql = self._build_insert_sql(table, columns, on_conflict,
+                                     tuple(conflict_columns or ()), tuple(update_columns or ()))
+        
+        counts: List[int] = []
+        start = time.perf_counter()
+        rows = chain((first,), iterator)
+        while True:
+            # 只为当前分块准备参数, 保证内存占用与总行数无关
+            params_list = [tuple(map(data.get, columns)) for data in islice(rows, chunk_size)]
+            if not params_list:
+                break
+            counts.append(self._write_chunk(sql, params_list))
+        
+        seconds = time.perf_counter() - start
+        total = sum(counts)
+        self.last_insert_stats = {
+            "rows": total,
+            "chunks": len(counts),
+            "seconds": seconds,
+            "rows_per_sec": total / seconds if seconds > 0 else 0.0,
+        }
+        return counts
+    
+    def _write_chunk(self, sql: str, params_list: List[Tuple]) -> int:
+        """在独立事务中写入一个分块
+        
+        Args:
+            sql (str): 插入语句
+            params_list (List[Tuple]): 当前分块的参数列表
+            
+        Returns:
+            int: 当前分块写入的行数
+        """
+        if self.pooled:
+            return self.execute_many(sql, params_list).rowcount
+        
+        if not self.conn or not self.cursor:
+            raise sqlite3.Error("数据库未连接, 请先调用 connect() 方法")
+        
+        # 已处于 begin_transaction() 开启的事务中时, 由用户负责提交
+        if self._manual_transaction:
+            return self._execute_many_on(self.cursor, sql, params_list).rowcount
+        
+        # sqlite3 为之前未提交的 execute() 隐式开启的事务, 先提交以免被并入分块事务后无人提交
+        if self.conn.in_transaction:
+            self.conn.commit()
+        self.conn.execute("BEGIN")
+        try:
+            rowcount = self._execute_many_on(self.cursor, sql, params_list).rowcount
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        return rowcount
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _build_insert_sql(table: str, columns: Tuple[str, ...], on_conflict: Optional[str] = None,
+                          conflict_columns: Tuple[str, ...] = (), update_columns: Tuple[str, ...] = ()) -> str:
+        """生成 INSERT 语句
         
-        # 准备参数列表
-        params_list = [tuple(data.values()) for data in data_list]
+        结果按参数做 LRU 缓存, 相同表和列组合的重复调用直接返回已生成的字符串。
         
-        # 批量执行
-        self.executemany(sql, params_list)
-        self.conn.commit()
+        Args:
+            table (str): 表名
+            columns (Tuple[str, ...]): 插入的列
+            on_conflict (Optional[str]): 冲突处理方式, None / "ignore" / "replace" / "update"
+            conflict_columns (Tuple[str, ...]): on_conflict="update" 时的冲突列
+            update_columns (Tuple[str, ...]): on_conflict="update" 时需要更新的列, 为空时更新除冲突列外的所有列
+            
+        Returns:
+            str: INSERT 语句
+        """
+        col_str = ', '.join(columns)
+        placeholders = ', '.join(['?'] * len(columns))
+        
+        if on_conflict is None:
+            return f"INSERT INTO {table} ({col_str}) VALUES ({placeholders})"
+        if on_conflict == "ignore":
+            return f"INSERT OR IGNORE INTO {table} ({col_str}) VALUES ({placeholders})"
+        if on_conflict == "replace":
+            return f"INSERT OR REPLACE INTO {table} ({col_str}) VALUES ({placeholders})"
+        if on_conflict == "update":
+            if not conflict_columns:
+                raise ValueError("on_conflict='update' 需要指定 conflict_columns")
+            targets = update_columns or tuple(col for col in columns if col not in conflict_columns)
+            if not targets:
+                return (f"INSERT INTO {table} ({col_str}) VALUES ({placeholders}) "
+                        f"ON CONFLICT ({', '.join(conflict_columns)}) DO NOTHING")
+            set_clause = ', '.join(f"{col} = excluded.{col}" for col in targets)
+            return (f"INSERT INTO {table} ({col_str}) VALUES ({placeholders}) "
+                    f"ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET {set_clause}")
+        raise ValueError(f"无效的 on_conflict: {on_conflict}, 可选值: 'ignore'、'replace'、'update'")
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _build_update_sql(table: str, columns: Tuple[str, ...], where: str) -> str:
+        """生成 UPDATE 语句, 结果按参数做 LRU 缓存
+        
+        Args:
+            table (str): 表名
+            columns (Tuple[str, ...]): 需要更新的列
+            where (str): WHERE 条件语句(不包含 WHERE 关键字)
+            
+        Returns:
+            str: UPDATE 语句
+        """
+        set_clause = ', '.join(f"{col} = ?" for col in columns)
+        return f"UPDATE {table} SET {set_clause} WHERE {where}"
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _build_delete_sql(table: str, where: str) -> str:
+        """生成 DELETE 语句, 结果按参数做 LRU 缓存
+        
+        Args:
+            table (str): 表名
+            where (str): WHERE 条件语句(不包含 WHERE 关键字)
+            
+        Returns:
+            str: DELETE 语句
+        """
+        return f"DELETE FROM {table} WHERE {where}"
     
     def update(self, table: str, data: Dict[str, Any], where: str, where_params: Union[Tuple, Dict, None] = None) -> int:
         """更新记录
@@ -352,9 +1067,8 @@ class SqliteUtils:
             >>> print(f"更新了 {affected} 行")
             >>> db.disconnect()
         """
-        # 构建 SET 子句
-        set_clause = ', '.join([f"{col} = ?" for col in data.keys()])
-        sql = f"UPDATE {table} SET {set_clause} WHERE {where}"
+        # 构建 SQL 语句(按表名、列名元组和条件缓存)
+        sql = self._build_update_sql(table, tuple(data), where)
         
         # 合并参数
         params = tuple(data.values())
@@ -366,10 +1080,10 @@ class SqliteUtils:
                 params = params + tuple(where_params.values())
         
         # 执行更新
-        self.execute(sql, params)
-        self.conn.commit()
+        cursor = self.execute(sql, params)
+        self._commit()
         
-        return self.cursor.rowcount
+        return cursor.rowcount
     
     def delete(self, table: str, where: str, where_params: Union[Tuple, Dict, None] = None) -> int:
         """删除记录
@@ -391,12 +1105,12 @@ class SqliteUtils:
             >>> print(f"删除了 {affected} 行")
             >>> db.disconnect()
         """
-        sql = f"DELETE FROM {table} WHERE {where}"
+        sql = self._build_delete_sql(table, where)
         
-        self.execute(sql, where_params)
-        self.conn.commit()
+        cursor = self.execute(sql, where_params)
+        self._commit()
         
-        return self.cursor.rowcount
+        return cursor.rowcount
     
     def table_exists(self, table_name: str) -> bool:
         """检查表是否存在
@@ -441,7 +1155,181 @@ class SqliteUtils:
             >>> db.disconnect()
         """
         sql = f"PRAGMA table_info({table_name})"
-        return self.fetchall(sql)
+        return self.fetch_all(sql)
+    
+    def _record_query(self, sql: str, params: Union[Tuple, Dict, None]) -> None:
+        """诊断模式下记录执行过的查询, 相同语句(忽略空白差异)只记录第一次的参数
+        
+        记录数超过 _DIAGNOSTIC_MAX_QUERIES 时淘汰最久未执行的语句, 避免拼接了字面值的 SQL
+        使记录无限增长。
+        
+        Args:
+            sql (str): SQL 语句
+            params (Union[Tuple, Dict, None]): SQL 参数, 用于之后执行 EXPLAIN QUERY PLAN
+        """
+        normalized = " ".join(sql.split())
+        with self._recorded_lock:
+            if normalized in self._recorded_queries:
+                self._recorded_queries.move_to_end(normalized)
+                return
+            if normalized.split(" ", 1)[0].upper() in self._DIAGNOSTIC_PREFIXES:
+                self._recorded_queries[normalized] = params
+                if len(self._recorded_queries) > self._DIAGNOSTIC_MAX_QUERIES:
+                    self._recorded_queries.popitem(last=False)
+    
+    def advise_indexes(self, min_rows: int = 10000, apply: bool = False) -> List[Dict[str, Any]]:
+        """根据执行计划给出索引建议
+        
+        对诊断模式下记录的每条语句执行 EXPLAIN QUERY PLAN, 找出对行数不少于 min_rows 的表做全表扫描
+        (SCAN 且未使用索引)的步骤, 再根据 WHERE / ON 条件中出现的该表列名生成 CREATE INDEX 语句:
+        等值条件列在前, 范围条件列(最多一个)在后。条件中没有可用列时(例如无过滤条件的全表读取)
+        仍会报告, 但 index_sql 为 None。
+        
+        Args:
+            min_rows (int): 表行数达到该值才报告, 默认为 10000
+            apply (bool): 是否直接执行建议的 CREATE INDEX 语句, 默认为 False
+            
+        Returns:
+            List[Dict[str, Any]]: 诊断结果列表, 每项包含 sql、table、rows、detail(执行计划描述)、
+                columns(建议的索引列)、index_sql 和 applied(是否已创建)
+            
+        Example:
+            >>> db = SqliteUtils('test.db', diagnostics=True)
+            >>> db.connect()
+            >>> db.fetch_all("SELECT * FROM users WHERE email = ?", ('a@b.com',))
+            >>> for advice in db.advise_indexes(min_rows=1000):
+            >>>     print(advice['detail'], '->', advice['index_sql'])
+            >>> SCAN users -> CREATE INDEX IF NOT EXISTS idx_users_email ON users (email)
+            >>> db.disconnect()
+        """
+        # 诊断自身的查询直接执行, 不进入记录。EXPLAIN 不读取数据, 已缓存的语句不会因其他连接修改 schema
+        # 而重新编译, 因此连接池模式下使用临时只读连接, 保证看到最新的索引
+        conn = self._open_reader() if self.pooled else self._read_connection()
+        try:
+            return self._advise_indexes(conn, min_rows, apply)
+        finally:
+            if self.pooled:
+                conn.close()
+    
+    def _advise_indexes(self, conn: Connection, min_rows: int, apply: bool) -> List[Dict[str, Any]]:
+        """在指定连接上分析执行计划, 参数与返回值见 advise_indexes()"""
+        row_counts: Dict[str, int] = {}
+        table_columns: Dict[str, List[str]] = {}
+        advices: List[Dict[str, Any]] = []
+        applied_sql = set()
+        
+        with self._recorded_lock:
+            recorded = list(self._recorded_queries.items())
+        for sql, params in recorded:
+            try:
+                plan = self._execute_on(conn.cursor(), f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            except sqlite3.Error:
+                # 记录后表被删除等情况, 跳过无法分析的语句
+                continue
+            aliases = self._parse_table_aliases(sql)
+            
+            for row in plan:
+                detail = row[-1]
+                match = re.match(r"SCAN (?:TABLE )?(\w+)(?: AS (\w+))?", detail)
+                if not match or " USING " in detail:
+                    continue
+                name = match.group(1)
+                table = aliases.get(name.lower(), name)
+                if table not in table_columns:
+                    table_columns[table] = [column[1] for column in self.get_table_info(table)]
+                if not table_columns[table]:
+                    # 子查询、CTE 等不是实际存在的表
+                    continue
+                if table not in row_counts:
+                    row_counts[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                if row_counts[table] < min_rows:
+                    continue
+                
+                prefixes = {table.lower(), (match.group(2) or name).lower()}
+                prefixes.update(alias for alias, target in aliases.items() if target == table)
+                columns = self._suggest_index_columns(sql, table_columns[table], prefixes)
+                index_sql = None
+                if columns:
+                    index_sql = (f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(columns)} "
+                                 f"ON {table} ({', '.join(columns)})")
+                
+                applied = False
+                if apply and index_sql:
+                    if index_sql not in applied_sql:
+                        self.execute(index_sql)
+                        self._commit()
+                        applied_sql.add(index_sql)
+                    applied = True
+                
+                advices.append({
+                    "sql": sql,
+                    "table": table,
+                    "rows": row_counts[table],
+                    "detail": detail,
+                    "columns": columns,
+                    "index_sql": index_sql,
+                    "applied": applied,
+                })
+        return advices
+    
+    @staticmethod
+    def _parse_table_aliases(sql: str) -> Dict[str, str]:
+        """解析 FROM / JOIN / UPDATE / DELETE FROM 后的表名及别名
+        
+        Args:
+            sql (str): SQL 语句
+            
+        Returns:
+            Dict[str, str]: 小写别名(包括表名本身)到表名的映射
+        """
+        keywords = {"WHERE", "JOIN", "ON", "LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "NATURAL",
+                    "FULL", "GROUP", "ORDER", "LIMIT", "SET", "USING", "INDEXED", "NOT", "UNION", "WINDOW"}
+        aliases: Dict[str, str] = {}
+        pattern = r"\b(?:FROM|JOIN|UPDATE)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?"
+        for table, alias in re.findall(pattern, sql, flags=re.IGNORECASE):
+            aliases[table.lower()] = table
+            if alias and alias.upper() not in keywords:
+                aliases[alias.lower()] = table
+        return aliases
+    
+    @staticmethod
+    def _suggest_index_columns(sql: str, columns: List[str], prefixes: set) -> List[str]:
+        """从 WHERE / ON 条件中找出可以建索引的列
+        
+        Args:
+            sql (str): SQL 语句
+            columns (List[str]): 被扫描表的全部列名
+            prefixes (set): 可以作为该表列名前缀的小写表名和别名
+            
+        Returns:
+            List[str]: 建议的索引列, 等值条件列在前, 最多追加一个范围条件列
+        """
+        # 只分析 WHERE 和 ON 条件, 截止到 GROUP BY / ORDER BY / LIMIT 等子句
+        conditions = " ".join(re.findall(
+            r"\b(?:WHERE|ON)\b(.*?)(?=\b(?:GROUP\s+BY|ORDER\s+BY|LIMIT|HAVING|WINDOW|UNION|"
+            r"(?:LEFT\s+|INNER\s+|CROSS\s+|RIGHT\s+|FULL\s+)?(?:OUTER\s+)?JOIN)\b|$)",
+            sql, flags=re.IGNORECASE | re.DOTALL))
+        if not conditions:
+            return []
+        
+        equality: List[str] = []
+        ranges: List[str] = []
+        for column in columns:
+            # 列名前有其他表的前缀时不属于当前表
+            ref = rf"(?:\b(\w+)\.)?\b{re.escape(column)}\b"
+            for match in re.finditer(rf"{ref}\s*(==?|IN\b|IS\b|<=?|>=?|BETWEEN\b|LIKE\b|GLOB\b)"
+                                     rf"|(==?|<=?|>=?)\s*{ref}", conditions, flags=re.IGNORECASE):
+                prefix = match.group(1) or match.group(4)
+                if prefix and prefix.lower() not in prefixes:
+                    continue
+                operator = (match.group(2) or match.group(3)).upper()
+                if operator in ("=", "==", "IN", "IS"):
+                    if column not in equality:
+                        equality.append(column)
+                elif column not in ranges:
+                    ranges.append(column)
+        
+        return equality + [column for column in ranges if column not in equality][:1]
     
     def begin_transaction(self) -> None:
         """开始事务
@@ -460,25 +1348,136 @@ class SqliteUtils:
             >>> except:
             >>>     db.rollback_transaction()
             >>> db.disconnect()
+            
+        Raises:
+            sqlite3.ProgrammingError: 连接池模式下写操作由写线程逐条提交, 不支持手动事务
         """
+        if self.pooled:
+            raise sqlite3.ProgrammingError("连接池模式不支持手动事务, 请使用 execute_many 在单个事务中批量写入")
         if self.conn:
             self.conn.execute("BEGIN TRANSACTION")
+            self._manual_transaction = True
     
     def commit_transaction(self) -> None:
         """提交事务
         
-        提交当前事务, 使所有更改生效。
+        提交当前事务, 使所有更改生效。连接池模式下写操作已自动提交, 不做任何处理。
         """
-        if self.conn:
+        if self.conn and not self.pooled:
             self.conn.commit()
+        self._manual_transaction = False
     
     def rollback_transaction(self) -> None:
         """回滚事务
         
-        回滚当前事务, 撤销所有未提交的更改。
+        回滚当前事务, 撤销所有未提交的更改。连接池模式下写操作已自动提交, 不做任何处理。
         """
-        if self.conn:
+        if self.conn and not self.pooled:
             self.conn.rollback()
+        self._manual_transaction = False
+    
+    def backup_to(self, path: str, pages_per_step: int = -1,
+                  progress_cb: Optional[Callable[[int, int, int], None]] = None) -> None:
+        """在线备份数据库
+        
+        基于 sqlite3.Connection.backup(SQLite Online Backup API)逐页复制数据库, 得到一致的快照,
+        WAL 模式下备份期间不会阻塞写入, 可以替代直接复制数据库文件的方式。
+        pages_per_step 为 -1 时一次性复制全部页面; 分步复制时如果其他连接在备份期间写入,
+        SQLite 会自动从头重新开始复制, 写入频繁时建议使用 -1。
+        
+        Args:
+            path (str): 备份文件路径, 已存在时会被覆盖
+            pages_per_step (int): 每一步复制的页数, 默认为 -1(一次性复制)
+            progress_cb (Optional[Callable[[int, int, int], None]]): 进度回调, 每一步完成后以
+                (status, remaining, total) 调用, 默认为 None
+                
+        Raises:
+            sqlite3.Error: 数据库未连接或备份失败时抛出异常
+            
+        Example:
+            >>> db = SqliteUtils('test.db')
+            >>> db.connect()
+            >>> db.backup_to('backup/test.db', pages_per_step=1000,
+            >>>              progress_cb=lambda status, remaining, total: print(f"{total - remaining}/{total}"))
+            >>> db.disconnect()
+        """
+        source = self._read_connection()
+        
+        # 确保备份文件所在目录存在
+        backup_dir = os.path.dirname(path)
+        if backup_dir and not os.path.exists(backup_dir):
+            os.makedirs(backup_dir)
+        
+        target = sqlite3.connect(path)
+        try:
+            source.backup(target, pages=pages_per_step, progress=progress_cb)
+        finally:
+            target.close()
+    
+    def incremental_vacuum(self, pages: Optional[int] = None) -> int:
+        """增量回收空闲页
+        
+        执行 PRAGMA incremental_vacuum, 将空闲页归还给文件系统, 每次只处理指定页数, 不会像 VACUUM 一样长时间锁库。
+        仅在 auto_vacuum = INCREMENTAL 的数据库上生效(需在建表前设置, 或设置后执行一次 VACUUM),
+        例如在 profile 中加入 {"auto_vacuum": "INCREMENTAL"}。
+        
+        Args:
+            pages (Optional[int]): 最多回收的页数, 默认为 None(回收全部空闲页)
+            
+        Returns:
+            int: 实际回收的页数
+            
+        Raises:
+            sqlite3.ProgrammingError: 处于 begin_transaction() 开启的事务中时抛出异常
+            
+        Example:
+            >>> db = SqliteUtils('test.db', profile={'auto_vacuum': 'INCREMENTAL'})
+            >>> db.connect()
+            >>> freed = db.incremental_vacuum(1000)
+            >>> print(f"回收了 {freed} 页")
+            >>> db.disconnect()
+        """
+        before = self.fetch_one("PRAGMA freelist_count")[0]
+        if pages is None:
+            self._execute_maintenance("PRAGMA incremental_vacuum")
+        else:
+            self._execute_maintenance(f"PRAGMA incremental_vacuum({int(pages)})")
+        after = self.fetch_one("PRAGMA freelist_count")[0]
+        return before - after
+    
+    def analyze(self, table: Optional[str] = None) -> None:
+        """收集统计信息
+        
+        执行 ANALYZE, 为查询优化器更新 sqlite_stat1 中的索引统计信息。
+        
+        Args:
+            table (Optional[str]): 表名或索引名, 默认为 None(分析整个数据库)
+            
+        Example:
+            >>> db = SqliteUtils('test.db')
+            >>> db.connect()
+            >>> db.analyze('users')
+            >>> db.disconnect()
+        """
+        self.execute(f"ANALYZE {table}" if table else "ANALYZE")
+        self._commit()
+    
+    def optimize(self) -> None:
+        """执行 PRAGMA optimize
+        
+        由 SQLite 自行判断哪些表的统计信息已过期并按需执行 ANALYZE, 开销远小于全库 ANALYZE,
+        适合长时间运行的服务定期调用或在关闭连接前调用。
+        
+        Raises:
+            sqlite3.ProgrammingError: 处于 begin_transaction() 开启的事务中时抛出异常
+        
+        Example:
+            >>> db = SqliteUtils('test.db')
+            >>> db.connect()
+            >>> db.optimize()
+            >>> db.disconnect()
+        """
+        self._execute_maintenance("PRAGMA optimize")
     
     def __enter__(self):
         """上下文管理器入口
@@ -505,3 +1504,134 @@ class SqliteUtils:
             self.commit_transaction()
         
         self.disconnect()
+
+
+def _release_reader(readers: List[Connection], lock: Any, conn: Connection) -> None:
+    """关闭已退出线程的只读连接并将其移出连接列表
+    
+    Args:
+        readers (List[Connection]): SqliteUtils 记录的只读连接列表
+        lock (Any): 保护 readers 的可重入锁
+        conn (Connection): 要关闭的连接
+    """
+    with lock:
+        if conn in readers:
+            readers.remove(conn)
+    conn.close()
+
+
+class _ReaderSlot:
+    """线程局部的只读连接槽位, 随线程退出被回收时触发 _release_reader"""
+    
+    __slots__ = ("conn", "__weakref__")
+    
+    def __init__(self, conn: Connection):
+        self.conn = conn
+
+
+class _WriteResult:
+    """写线程执行结果的快照, 在写线程内读取全部结果行, 提交后交给调用线程使用
+    
+    写连接的游标归写线程所有, 且结果未读完时无法提交(如 INSERT ... RETURNING),
+    因此不能把游标本身返回给调用方。
+    """
+    rowcount = -1  # 影响的行数
+    lastrowid: Optional[int] = None  # 最后插入行的 rowid
+    description = None  # 结果列描述, 与 Cursor.description 相同
+    
+    def __init__(self, cursor: Cursor):
+        """读取游标的全部结果并关闭游标
+        
+        Args:
+            cursor (Cursor): 写线程中执行完语句的游标
+        """
+        self.description = cursor.description
+        self._rows = cursor.fetchall() if cursor.description else []
+        self.rowcount = cursor.rowcount  # RETURNING 语句的 rowcount 在读完结果后才准确
+        self.lastrowid = cursor.lastrowid
+        self._index = 0
+        cursor.close()
+    
+    def fetchone(self) -> Optional[Any]:
+        """返回下一行, 没有更多行时返回 None"""
+        if self._index >= len(self._rows):
+            return None
+        self._index += 1
+        return self._rows[self._index - 1]
+    
+    def fetchmany(self, size: int = 1) -> List[Any]:
+        """返回接下来的最多 size 行"""
+        rows = self._rows[self._index:self._index + size]
+        self._index += len(rows)
+        return rows
+    
+    def fetchall(self) -> List[Any]:
+        """返回剩余的全部行"""
+        rows = self._rows[self._index:]
+        self._index = len(self._rows)
+        return rows
+    
+    def __iter__(self):
+        """逐行迭代剩余结果"""
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+
+class _SqliteWriter:
+    """SQLite 写线程, 由 SqliteUtils 连接池模式创建, 串行执行所有写操作并逐条提交"""
+    _conn: Optional[Connection] = None  # 写连接, 只在写线程中使用
+    _queue: Optional[queue.Queue] = None  # 待执行的写任务队列
+    _thread: Optional[threading.Thread] = None  # 写线程
+    
+    def __init__(self, conn: Connection):
+        """初始化并启动写线程
+        
+        Args:
+            conn (Connection): 写连接, 需以 check_same_thread=False 打开
+        """
+        self._conn = conn
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="SqliteUtils-writer", daemon=True)
+        self._thread.start()
+    
+    def submit(self, func: Callable[[Connection], Any]) -> Any:
+        """提交写任务并等待执行结果
+        
+        Args:
+            func (Callable[[Connection], Any]): 写任务, 接收写连接作为参数
+            
+        Returns:
+            Any: 写任务的返回值
+            
+        Raises:
+            Exception: 写任务抛出的异常会在调用线程中重新抛出
+        """
+        future: Future = Future()
+        self._queue.put((future, func))
+        return future.result()
+    
+    def _run(self) -> None:
+        """写线程主循环, 成功则提交, 失败则回滚并把异常交给调用方"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            future, func = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = func(self._conn)
+                self._conn.commit()
+            except BaseException as e:
+                self._conn.rollback()
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+    
+    def close(self) -> None:
+        """处理完队列中剩余的写任务后停止写线程"""
+        self._queue.put(None)
+        self._thread.join()